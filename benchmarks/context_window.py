@@ -0,0 +1,53 @@
+"""
+Accuracy/latency tradeoff of entity-centred context windows for role classification.
+
+Extracts the mentions of the packaged example abstracts, classifies them with the whole sentence
+as context (the reference) and with windows of N tokens on each side of the entity, and reports
+the mean context length, role classification time and agreement with the reference labels.
+
+    python -m benchmarks.context_window [--windows 16 32 64 128] [--repeat 3]
+"""
+import argparse
+import time
+
+from geordie import Geordie, load_examples
+from geordie.batching import token_lengths
+
+
+def classify(classifier, mentions, context_window, repeat):
+    classifier.context_window = context_window
+    best = float("inf")
+    for _ in range(repeat):
+        items = [dict(item) for item in mentions]
+        start = time.perf_counter()
+        classifier.classify_role_from_corpus(items)
+        best = min(best, time.perf_counter() - start)
+    lengths = token_lengths(classifier.tokenizer, classifier.trim_contexts([item["context"] for item in items]))
+    return [item["role"][0]["label"] for item in items], best, sum(lengths) / len(lengths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--windows", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per setting; the fastest is reported.")
+    parser.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    geordie = Geordie(device=args.device)
+    mentions = []
+    for text in load_examples():
+        mentions.extend(geordie.get_context_of_the_mention(text, geordie.ner.extract_entities(text)))
+    print(f"{len(mentions)} mentions")
+
+    classifier = geordie.entity_classifier
+    reference, reference_time, reference_tokens = classify(classifier, mentions, None, args.repeat)
+    print(f"{'window':>8} | {'tokens/ctx':>10} | {'time (s)':>8} | {'speed-up':>8} | {'agreement':>9}")
+    print(f"{'sentence':>8} | {reference_tokens:>10.1f} | {reference_time:>8.3f} | {1:>7.2f}x | {1:>9.1%}")
+    for window in args.windows:
+        labels, elapsed, tokens = classify(classifier, mentions, window, args.repeat)
+        agreement = sum(a == b for a, b in zip(labels, reference)) / len(reference)
+        print(f"{window:>8} | {tokens:>10.1f} | {elapsed:>8.3f} | {reference_time / elapsed:>7.2f}x | {agreement:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Offline stand-ins for the network services used by geordie, for benchmarks.
+"""
+import copy
+import pickle
+import threading
+import time
+import zlib
+
+from geordie.disambiguation import static_cache_path
+
+
+class FakeLocation:
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+
+class FakeGeocoder:
+    """
+    Drop-in replacement for geopy's Nominatim that replays the raw records of data/static_cache.pkl.
+    - Known entities (case-insensitive) return their recorded result, negatives included.
+    - Unknown entities replay a recorded positive record chosen deterministically from the query,
+      with the query as its name, so every distinct entity gets its own realistic payload.
+    - Every call waits `latency` seconds, like a network round trip.
+    """
+    def __init__(self, latency: float = 0.0, records_path: str = static_cache_path):
+        with open(records_path, "rb") as f:
+            records = pickle.load(f)
+        self.latency = latency
+        self.records = {entity.strip().lower(): raw for entity, raw in records.items()}
+        self.positives = [raw for raw in records.values() if raw is not None]
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def geocode(self, query, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        entity = query.strip().lower()
+        if entity in self.records:
+            raw = self.records[entity]
+            return FakeLocation(raw) if raw is not None else None
+        checksum = zlib.crc32(entity.encode("utf-8"))
+        raw = copy.deepcopy(self.positives[checksum % len(self.positives)])
+        raw["place_id"] = checksum
+        raw["name"] = query
+        return FakeLocation(raw)
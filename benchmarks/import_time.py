@@ -0,0 +1,61 @@
+"""
+Import-time regression check for `import geordie`.
+
+Runs `python -X importtime` in a fresh interpreter on the light entry points (importing the package,
+load_examples() and the normaliser), reports the slowest imports, and fails if a heavy dependency
+is imported or the total exceeds the budget.
+
+    python -m benchmarks.import_time [--budget-ms 250] [--top 10]
+"""
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ("torch", "transformers", "nltk", "geopy", "pandas")
+
+SNIPPET = "import geordie; geordie.load_examples(); geordie.normalise_geographical_entity('Spanish')"
+
+
+def import_times(snippet: str):
+    """
+    Cumulative import time (microseconds) of every module imported by a snippet, from `-X importtime`.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Maximum cumulative import time of geordie.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show.")
+    args = parser.parse_args()
+
+    times = import_times(SNIPPET)
+    total_ms = times["geordie"] / 1e3
+    heavy = sorted({name.split(".")[0] for name in times} & set(HEAVY_MODULES))
+
+    print(f"import geordie: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, cumulative in sorted(times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1e3:>8.1f} ms  {name}")
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy dependencies imported: {', '.join(heavy)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""
+Memory held by linked results and the EntityLinker cache with each raw_payloads mode.
+
+Links a synthetic corpus of mentions (distinct entities replaying the records of data/static_cache.pkl,
+repeated like real place names are) with a fake geocoder, keeps the results alive as a corpus run does,
+and reports the traced Python memory for "keep" (full osm_raw on every item and cache entry), "drop",
+"ref" with the default in-memory raw_store (an LRU bounded by cache_maxsize, like the cache), and "ref"
+with a shelve file as raw_store.
+
+    python -m benchmarks.linker_memory [--entities 5000] [--mentions 50000]
+"""
+import argparse
+import gc
+import os
+import random
+import shelve
+import tempfile
+import tracemalloc
+
+from geordie.disambiguation import EntityLinker
+
+from .fakes import FakeGeocoder
+
+
+def measure(raw_payloads: str, mentions: list, cache_maxsize: int, raw_store=None):
+    geocoder = FakeGeocoder()
+    gc.collect()
+    tracemalloc.start()
+    linker = EntityLinker(
+        sleep_between_calls=0, static_cache=False, cache_maxsize=cache_maxsize,
+        raw_payloads=raw_payloads, raw_store=raw_store,
+    )
+    linker.app = geocoder
+    results = linker.link_entities([{"entity": entity} for entity in mentions])
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stored = len(linker.raw_store)
+    del results, linker
+    return current, peak, stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=5000, help="Distinct entities.")
+    parser.add_argument("--mentions", type=int, default=50000, help="Mentions linked (and kept).")
+    parser.add_argument("--cache-maxsize", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entities = [f"Place {i}" for i in range(args.entities)]
+    # Zipf-like repetition, as place names are in real corpora
+    mentions = rng.choices(entities, weights=[1 / (rank + 1) for rank in range(len(entities))], k=args.mentions)
+
+    print(f"{args.mentions} mentions of {args.entities} entities, cache_maxsize={args.cache_maxsize}")
+    print(f"{'mode':>10} | {'retained (MiB)':>14} | {'peak (MiB)':>10} | {'raw records stored':>18}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        with shelve.open(os.path.join(tmp, "raw")) as disk_store:
+            for label, mode, store in [
+                ("keep", "keep", None), ("drop", "drop", None), ("ref", "ref", None), ("ref+shelve", "ref", disk_store)
+            ]:
+                current, peak, stored = measure(mode, mentions, args.cache_maxsize, store)
+                baseline = baseline or current
+                print(
+                    f"{label:>10} | {current / 2**20:>14.1f} | {peak / 2**20:>10.1f} | {stored:>18}"
+                    f"   ({current / baseline:.0%} of keep)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+NER coverage and cost on documents longer than the model's 512 tokens.
+
+Builds long documents by concatenating the example abstracts and runs NER with truncation (stride=None,
+as geordie did before windowing) and with overlapping windows of several sizes. Reports the entities
+found, how far into the text they reach, the number of windows and the time per document.
+
+    python -m benchmarks.long_documents [--copies 4] [--windows 512:128 256:64] [--ner-model SIRIS-Lab/geordie-ner]
+    python -m benchmarks.long_documents --tiny    # offline, with tiny random models
+"""
+import argparse
+import tempfile
+import time
+
+from geordie import load_examples
+from geordie.ner import GeordieNER
+
+from .tiny_models import build_tiny_models
+
+
+def count_windows(ner: GeordieNER, text: str) -> int:
+    if ner.stride is None:
+        return 1
+    encoded = ner.tokenizer(text, truncation=True, stride=ner.stride, return_overflowing_tokens=True)
+    return len(encoded["input_ids"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ner-model", default="SIRIS-Lab/geordie-ner")
+    parser.add_argument("--tiny", action="store_true", help="Use a tiny random model instead (no download).")
+    parser.add_argument("--copies", type=int, default=4, help="Abstracts concatenated per document.")
+    parser.add_argument("--windows", nargs="+", default=["512:128", "256:64"], help="window_size:stride pairs.")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    abstracts = load_examples()
+    documents = [" ".join((abstracts * args.copies)[i:i + args.copies]) for i in range(len(abstracts))]
+    lengths = [len(document) for document in documents]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = build_tiny_models(tmp)["ner"] if args.tiny else args.ner_model
+        configurations = [("truncated", 512, None)] + [
+            (f"window {pair}", *map(int, pair.split(":"))) for pair in args.windows
+        ]
+        print(f"{len(documents)} documents of {min(lengths)}-{max(lengths)} characters")
+        print(f"{'mode':>16} | {'entities':>8} | {'reach':>6} | {'windows':>7} | {'s/doc':>6}")
+        for label, window_size, stride in configurations:
+            ner = GeordieNER("cpu", model_name=model, window_size=window_size, stride=stride)
+            ner.extract_entities(documents[0][:200])  # warm up
+            windows = sum(count_windows(ner, document) for document in documents)
+            start = time.perf_counter()
+            entities = [ner.extract_entities(document, batch_size=args.batch_size) for document in documents]
+            seconds = (time.perf_counter() - start) / len(documents)
+            # Share of the text up to the last entity found, averaged over documents
+            reach = sum(max((e["end"] for e in found), default=0) / length for found, length in zip(entities, lengths))
+            print(
+                f"{label:>16} | {sum(len(found) for found in entities):>8} | {reach / len(documents):>6.1%} | "
+                f"{windows:>7} | {seconds:>6.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
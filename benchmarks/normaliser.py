@@ -0,0 +1,88 @@
+"""
+Trie-based normaliser vs the former regex alternation.
+
+Checks that both (and the prebuilt bundle) produce the same output and times them on mention-like inputs: every
+demonym/adjective/country code key, the same keys in context, and random spans of the example
+abstracts (mostly non-matching text).
+
+    python -m benchmarks.normaliser [--repeat 5]
+"""
+import argparse
+import random
+import re
+import time
+
+from geordie import load_examples
+from geordie.normalisation import GeoNormaliser, load_bundle
+from geordie.resources.demonyms_and_adjectives import pattern, transformed_dict, base_transformed_dict
+
+
+def regex_normalise(entity: str) -> str:
+    return re.sub(
+        pattern,
+        lambda match: base_transformed_dict.get(match.group(0), match.group(0)),
+        entity,
+        flags=re.IGNORECASE,
+    )
+
+
+def build_inputs(seed: int):
+    rng = random.Random(seed)
+    keys = list(transformed_dict)
+    text = " ".join(load_examples())
+    spans = [text[a:a + rng.randint(3, 40)] for a in (rng.randrange(len(text)) for _ in range(5000))]
+    in_context = [f"{rng.choice(keys)} coast of the {rng.choice(keys)} region" for _ in range(2000)]
+    return keys + in_context + spans
+
+
+def timed(function, inputs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for entity in inputs:
+            function(entity)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per matcher; the fastest is reported.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    inputs = build_inputs(args.seed)
+
+    re.purge()
+    start = time.perf_counter()
+    regex_normalise("warm-up")
+    regex_setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normaliser = GeoNormaliser(transformed_dict.keys(), base_transformed_dict)
+    trie_setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bundled = load_bundle()
+    bundle_setup = time.perf_counter() - start
+    if bundled is None:
+        print("Packaged bundle missing or stale; run `python -m geordie.resources.build`")
+        return 1
+
+    mismatches = [
+        entity for entity in inputs
+        if not regex_normalise(entity) == normaliser.normalise(entity) == bundled.normalise(entity)
+    ]
+    print(f"{len(inputs)} inputs, {len(mismatches)} mismatches")
+
+    regex_time = timed(regex_normalise, inputs, args.repeat)
+    trie_time = timed(normaliser.normalise, inputs, args.repeat)
+    print(f"{'matcher':>7} | {'setup (ms)':>10} | {'us/call':>8}")
+    print(f"{'regex':>7} | {regex_setup * 1e3:>10.1f} | {regex_time / len(inputs) * 1e6:>8.2f}")
+    print(f"{'trie':>7} | {trie_setup * 1e3:>10.1f} | {trie_time / len(inputs) * 1e6:>8.2f}")
+    print(f"{'bundle':>7} | {bundle_setup * 1e3:>10.1f} |")
+    print(f"speed-up: {regex_time / trie_time:.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
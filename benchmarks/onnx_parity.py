@@ -0,0 +1,119 @@
+"""
+Parity and speed of the ONNX Runtime backend against the PyTorch backend.
+
+Runs NER over the packaged example abstracts and role classification over their marked mentions with
+both backends, and checks that the aggregated entities (group, word, offsets) and the role labels are
+identical and the scores agree within --atol. Exits with status 1 on any mismatch.
+
+    python -m benchmarks.onnx_parity [--ner-model SIRIS-Lab/geordie-ner] [--role-model SIRIS-Lab/geordie-role]
+    python -m benchmarks.onnx_parity --tiny    # offline, with tiny random models
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from geordie import _sentence_spans, load_examples
+from geordie.ner import GeordieNER
+from geordie.role_classification import RoleClassifier
+
+from .tiny_models import build_tiny_models
+
+
+def marked_contexts(texts, entities_per_text) -> list[str]:
+    # The sentence of each entity with the entity marked, as Geordie feeds the role classifier
+    contexts = []
+    for text, entities in zip(texts, entities_per_text):
+        spans = _sentence_spans(text)
+        for entity in entities:
+            for start, end in spans:
+                if start <= entity["start"] < end:
+                    stop = min(entity["end"], end)
+                    contexts.append(
+                        f"{text[start:entity['start']]}[START_ENT] {text[entity['start']:stop]} [END_ENT]{text[stop:end]}"
+                    )
+                    break
+    return contexts
+
+
+def compare_entities(expected, actual, atol: float) -> list[str]:
+    problems = []
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        keys_a = [(e["entity_group"], e["word"], e["start"], e["end"]) for e in a]
+        keys_b = [(e["entity_group"], e["word"], e["start"], e["end"]) for e in b]
+        if keys_a != keys_b:
+            problems.append(f"text {index}: entities differ: {keys_a} != {keys_b}")
+            continue
+        for e, f in zip(a, b):
+            if abs(float(e["score"]) - float(f["score"])) > atol:
+                problems.append(f"text {index}: score of {e['word']!r} differs: {e['score']} != {f['score']}")
+    return problems
+
+
+def compare_roles(expected, actual, atol: float) -> list[str]:
+    problems = []
+    for index, (a, b) in enumerate(zip(expected, actual)):
+        role_a, role_b = a["role"][0], b["role"][0]
+        if role_a["label"] != role_b["label"]:
+            problems.append(f"mention {index}: label differs: {role_a['label']} != {role_b['label']}")
+        elif abs(role_a["score"] - role_b["score"]) > atol:
+            problems.append(f"mention {index}: score differs: {role_a['score']} != {role_b['score']}")
+    return problems
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ner-model", default="SIRIS-Lab/geordie-ner")
+    parser.add_argument("--role-model", default="SIRIS-Lab/geordie-role")
+    parser.add_argument("--tiny", action="store_true", help="Use tiny random models instead (no download).")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--copies", type=int, default=3, help="Times the examples are repeated for timing.")
+    parser.add_argument("--atol", type=float, default=1e-4, help="Tolerance on scores.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ner_model, role_model = args.ner_model, args.role_model
+        if args.tiny:
+            tiny = build_tiny_models(tmp)
+            ner_model, role_model = tiny["ner"], tiny["role"]
+            # Keep the throwaway exports out of the user's cache
+            os.environ["GEORDIE_ONNX_CACHE"] = os.path.join(tmp, "onnx")
+
+        texts = load_examples() * args.copies
+        outputs, seconds = {}, {}
+        for backend in ("torch", "onnx"):
+            ner = GeordieNER("cpu", model_name=ner_model, backend=backend)
+            classifier = RoleClassifier("cpu", model_name=role_model, backend=backend)
+            ner.extract_entities_from_corpus(texts[:2], batch_size=args.batch_size)  # warm up
+            entities, ner_seconds = timed(ner.extract_entities_from_corpus, texts, args.batch_size)
+            # Role inputs from the PyTorch entities, so both backends classify the same contexts
+            if backend == "torch":
+                mentions = [{"context": context} for context in marked_contexts(texts, entities)]
+            roles, role_seconds = timed(
+                classifier.classify_role_from_corpus, [dict(item) for item in mentions], args.batch_size
+            )
+            outputs[backend] = (entities, roles)
+            seconds[backend] = (ner_seconds, role_seconds)
+
+    problems = compare_entities(outputs["torch"][0], outputs["onnx"][0], args.atol)
+    problems += compare_roles(outputs["torch"][1], outputs["onnx"][1], args.atol)
+    n_entities = sum(len(found) for found in outputs["torch"][0])
+    print(f"{len(texts)} texts, {n_entities} entities, {len(mentions)} role inputs")
+    print(f"{'backend':>8} | {'NER (s)':>8} | {'role (s)':>8}")
+    for backend, (ner_seconds, role_seconds) in seconds.items():
+        print(f"{backend:>8} | {ner_seconds:>8.3f} | {role_seconds:>8.3f}")
+    for problem in problems[:20]:
+        print(problem)
+    print("parity: OK" if not problems else f"parity: {len(problems)} mismatches")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Padded-token waste of naive vs length-sorted batching.
+
+Builds a mixed workload from the packaged example abstracts (whole abstracts, as fed to NER, plus
+their sentences, as fed to role classification), shuffles it the way a real corpus arrives, and
+counts how many tokens each batching strategy pushes through the model.
+
+    python -m benchmarks.padding_waste [--tokenizer SIRIS-Lab/geordie-role] [--batch-sizes 8 16 32]
+"""
+import argparse
+import random
+
+from nltk.tokenize import sent_tokenize
+from transformers import AutoTokenizer
+
+from geordie import load_examples
+from geordie.batching import token_lengths, length_sorted_order, padding_stats
+
+
+def build_workload(copies: int, seed: int):
+    abstracts = load_examples()
+    sentences = [sentence for abstract in abstracts for sentence in sent_tokenize(abstract)]
+    texts = (abstracts + sentences) * copies
+    random.Random(seed).shuffle(texts)
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", default="SIRIS-Lab/geordie-role")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--copies", type=int, default=10, help="Times the example workload is repeated.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    tokenizer.model_max_length = 512
+    texts = build_workload(args.copies, args.seed)
+    lengths = token_lengths(tokenizer, texts)
+    order = length_sorted_order(lengths)
+
+    print(f"{len(texts)} inputs, {sum(lengths)} real tokens, lengths {min(lengths)}-{max(lengths)}")
+    print(f"{'batch':>5} | {'naive padded':>12} {'waste':>6} | {'sorted padded':>13} {'waste':>6} | {'saved':>6}")
+    for batch_size in args.batch_sizes:
+        naive = padding_stats(lengths, batch_size)
+        bucketed = padding_stats(lengths, batch_size, order)
+        saved = 1 - bucketed["padded_tokens"] / naive["padded_tokens"]
+        print(
+            f"{batch_size:>5} | {naive['padded_tokens']:>12} {naive['waste']:>6.1%} | "
+            f"{bucketed['padded_tokens']:>13} {bucketed['waste']:>6.1%} | {saved:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Scaling of the multiprocess corpus runner (Geordie.process_corpus_parallel) with the number of workers.
+
+Runs the example abstracts, repeated --scale times, with 1 worker (process_corpus in this process, with
+--threads torch threads) and with each number of --workers (forked workers with --torch-threads each),
+using tiny random models and the fake geocoder as benchmarks.pipeline does. Tiny models are cheap
+compared with the per-task overhead: use --dim 768 --layers 6 (DistilBERT size) for realistic scaling.
+
+    python -m benchmarks.parallel [--workers 2 4 8] [--scale 20] [--dim 768 --layers 6]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from geordie import load_examples
+
+from .pipeline import build_pipeline
+from .tiny_models import build_tiny_models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--scale", type=int, default=20, help="Times the example abstracts are repeated.")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="torch threads of the 1-process run.")
+    parser.add_argument("--torch-threads", type=int, default=1, help="torch threads per worker.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per fake geocoder call.")
+    parser.add_argument("--dim", type=int, default=32, help="Hidden size of the tiny models.")
+    parser.add_argument("--layers", type=int, default=2, help="Layers of the tiny models.")
+    args = parser.parse_args()
+    args.geocode_workers = 1
+
+    import torch
+
+    texts = load_examples() * args.scale
+    with tempfile.TemporaryDirectory() as tmp:
+        models = build_tiny_models(tmp, dim=args.dim, layers=args.layers)
+        print(f"{len(texts)} documents, {os.cpu_count()} CPUs")
+        print(f"{'workers':>7} | {'threads':>7} | {'seconds':>7} | {'docs/s':>7} | {'speedup':>7}")
+
+        # Each run gets a fresh pipeline (and linker cache); workers are forked from it
+        torch.set_num_threads(args.threads)
+        geordie, _ = build_pipeline(args, models)
+        start = time.perf_counter()
+        geordie.process_corpus(texts, batch_size=args.batch_size)
+        baseline = time.perf_counter() - start
+        print(f"{1:>7} | {args.threads:>7} | {baseline:>7.2f} | {len(texts) / baseline:>7.1f} | {1:>6.2f}x")
+
+        for workers in args.workers:
+            geordie, _ = build_pipeline(args, models)
+            start = time.perf_counter()
+            results = list(geordie.process_corpus_parallel(
+                texts, workers=workers, batch_size=args.batch_size, torch_threads=args.torch_threads,
+            ))
+            seconds = time.perf_counter() - start
+            assert len(results) == len(texts)
+            print(
+                f"{workers:>7} | {args.torch_threads:>7} | {seconds:>7.2f} | {len(texts) / seconds:>7.1f} | "
+                f"{baseline / seconds:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+End-to-end throughput of the Geordie pipeline, offline.
+
+Runs the packaged example abstracts, repeated --scale times, through process_corpus (or process_text per
+document) with tiny random DistilBERT models (see benchmarks.tiny_models) and a fake geocoder replaying
+data/static_cache.pkl with --latency seconds per call, so no download or Nominatim access is needed.
+Reports docs/sec, mentions/sec, the time per stage (from a second, instrumented run, since counting
+tokens adds tokenizer passes) and the peak memory. Save the report with --json to compare commits:
+
+    python -m benchmarks.pipeline [--scale 10] [--mode corpus] [--batch-size 8] [--latency 0.0] [--json out.json]
+    python -m benchmarks.pipeline --ner-model SIRIS-Lab/geordie-ner --role-model SIRIS-Lab/geordie-role
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from geordie import Geordie, load_examples
+from geordie.disambiguation import EntityLinker
+from geordie.metrics import MetricsRegistry
+
+from .fakes import FakeGeocoder
+from .tiny_models import build_tiny_models
+
+
+def peak_rss_mib():
+    # Peak resident set size of this process so far (None where the resource module is unavailable)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_pipeline(args, models: dict, metrics=None) -> tuple[Geordie, FakeGeocoder]:
+    geocoder = FakeGeocoder(latency=args.latency)
+    linker = EntityLinker(sleep_between_calls=0, max_workers=args.geocode_workers)
+    linker.app = geocoder
+    geordie = Geordie(
+        device="cpu", entity_linker=linker, metrics=metrics, ner_model=models["ner"], role_model=models["role"],
+    )
+    return geordie, geocoder
+
+
+def run(geordie: Geordie, texts: list, args) -> list:
+    if args.mode == "corpus":
+        return geordie.process_corpus(texts, batch_size=args.batch_size)
+    return [geordie.process_text(text) for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=10, help="Times the example abstracts are repeated.")
+    parser.add_argument("--mode", choices=["corpus", "text"], default="corpus")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per fake geocoder call.")
+    parser.add_argument("--geocode-workers", type=int, default=1, help="EntityLinker max_workers.")
+    parser.add_argument("--ner-model", help="NER model id or directory (default: a tiny random model).")
+    parser.add_argument("--role-model", help="Role model id or directory (default: a tiny random model).")
+    parser.add_argument("--dim", type=int, default=32, help="Hidden size of the tiny models.")
+    parser.add_argument("--layers", type=int, default=2, help="Layers of the tiny models.")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads.")
+    parser.add_argument("--no-stages", action="store_true", help="Skip the instrumented run.")
+    parser.add_argument("--json", help="Write the report to this file.")
+    args = parser.parse_args()
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    texts = load_examples() * args.scale
+    with tempfile.TemporaryDirectory() as tmp:
+        models = {"ner": args.ner_model, "role": args.role_model}
+        if not (args.ner_model and args.role_model):
+            tiny = build_tiny_models(tmp, dim=args.dim, layers=args.layers)
+            models = {name: path or tiny[name] for name, path in models.items()}
+
+        rss_before = peak_rss_mib()
+        geordie, geocoder = build_pipeline(args, models)
+        # Warm up (lazy initialisation, first forward pass) on a fresh linker cache
+        run(geordie, texts[:2], args)
+        geordie.entity_linker.clear_cache()
+        geocoder.calls = 0
+
+        start = time.perf_counter()
+        results = run(geordie, texts, args)
+        elapsed = time.perf_counter() - start
+        mentions = sum(len(result) for result in results)
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "torch_threads": torch.get_num_threads(),
+            "models": models if args.ner_model or args.role_model else {"tiny": {"dim": args.dim, "layers": args.layers}},
+            "mode": args.mode,
+            "batch_size": args.batch_size,
+            "latency": args.latency,
+            "documents": len(texts),
+            "mentions": mentions,
+            "geocode_calls": geocoder.calls,
+            "seconds": elapsed,
+            "docs_per_second": len(texts) / elapsed,
+            "mentions_per_second": mentions / elapsed,
+            "peak_rss_mib": peak_rss_mib(),
+            "rss_growth_mib": None if rss_before is None else peak_rss_mib() - rss_before,
+        }
+        del geordie, results
+
+        if not args.no_stages:
+            metrics = MetricsRegistry()
+            geordie, _ = build_pipeline(args, models, metrics=metrics)
+            run(geordie, texts, args)
+            snapshot = metrics.snapshot()
+            tokens = {entry["labels"]["stage"]: entry["value"] for entry in snapshot["counters"]["geordie_stage_tokens_total"]}
+            report["stages"] = {
+                entry["labels"]["stage"]: {"seconds": entry["sum"], "calls": entry["count"], "tokens": tokens.get(entry["labels"]["stage"])}
+                for entry in snapshot["histograms"]["geordie_stage_seconds"]
+            }
+
+    print(
+        f"{report['documents']} documents, {mentions} mentions, {report['geocode_calls']} geocoder calls "
+        f"({args.mode} mode, batch_size={args.batch_size}, latency={args.latency}s)"
+    )
+    print(f"{report['seconds']:.2f} s | {report['docs_per_second']:.1f} docs/s | {report['mentions_per_second']:.1f} mentions/s")
+    if report["peak_rss_mib"] is not None:
+        print(f"peak RSS {report['peak_rss_mib']:.0f} MiB (+{report['rss_growth_mib']:.0f} MiB during the run)")
+    if "stages" in report:
+        total = sum(stage["seconds"] for stage in report["stages"].values())
+        print(f"{'stage':>8} | {'seconds':>8} | {'share':>6} | {'tokens':>8}")
+        for name, stage in report["stages"].items():
+            tokens = "" if stage["tokens"] is None else f"{stage['tokens']:.0f}"
+            print(f"{name:>8} | {stage['seconds']:>8.3f} | {stage['seconds'] / total:>6.1%} | {tokens:>8}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
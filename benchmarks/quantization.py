@@ -0,0 +1,148 @@
+"""
+Accuracy, speed and memory of precision="int8" (dynamic quantization) against fp32.
+
+Runs NER over the texts and role classification over the marked mentions with both precisions and reports:
+- entity-level F1 (exact span and group) and role accuracy. Without --gold, the fp32 predictions are the
+  reference, so the int8 scores are the deltas against fp32 directly. With --gold, both precisions are
+  scored against the annotations and the deltas are reported.
+- NER and role inference time, and the serialized size of the model weights.
+
+--gold is a JSONL file with one document per line:
+    {"text": "...", "entities": [{"start": 10, "end": 16, "role": "STUDY_AREA"}, ...]}
+("role" is optional; entity groups are not compared against gold, as geordie predicts a single GEO group).
+
+    python -m benchmarks.quantization [--gold annotations.jsonl] [--copies 3]
+    python -m benchmarks.quantization --tiny    # offline, with tiny random models
+"""
+import argparse
+import io
+import json
+import tempfile
+import time
+
+import torch
+
+from geordie import load_examples
+from geordie.ner import GeordieNER
+from geordie.role_classification import RoleClassifier
+
+from .onnx_parity import marked_contexts
+from .tiny_models import build_tiny_models
+
+
+def weights_mib(model) -> float:
+    # Serialized size of the weights (the packed int8 weights of quantized layers are not parameters)
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return len(buffer.getvalue()) / 2**20
+
+
+def f1(reference: list[set], predicted: list[set]) -> float:
+    true_positives = sum(len(r & p) for r, p in zip(reference, predicted))
+    n_reference = sum(len(r) for r in reference)
+    n_predicted = sum(len(p) for p in predicted)
+    if not n_reference and not n_predicted:
+        return 1.0
+    precision = true_positives / n_predicted if n_predicted else 0.0
+    recall = true_positives / n_reference if n_reference else 0.0
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def accuracy(reference: list, predicted: list) -> float:
+    return sum(r == p for r, p in zip(reference, predicted)) / len(reference) if reference else 1.0
+
+
+def load_gold(path: str):
+    texts, spans = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                document = json.loads(line)
+                texts.append(document["text"])
+                spans.append(document["entities"])
+    return texts, spans
+
+
+def run(precision: str, models: dict, texts: list, role_entities: list, batch_size: int) -> dict:
+    ner = GeordieNER("cpu", model_name=models["ner"], precision=precision)
+    classifier = RoleClassifier("cpu", model_name=models["role"], precision=precision)
+    ner.extract_entities_from_corpus(texts[:2], batch_size=batch_size)  # warm up
+
+    start = time.perf_counter()
+    entities = ner.extract_entities_from_corpus(texts, batch_size=batch_size)
+    ner_seconds = time.perf_counter() - start
+
+    # Roles of a fixed set of mentions (gold or fp32 spans), so both precisions classify the same contexts
+    mentions = [{"context": context} for context in marked_contexts(texts, role_entities or entities)]
+    start = time.perf_counter()
+    roles = classifier.classify_role_from_corpus(mentions, batch_size=batch_size)
+    role_seconds = time.perf_counter() - start
+    return {
+        "spans": [{(e["start"], e["end"], e["entity_group"]) for e in found} for found in entities],
+        "entities": entities,
+        "roles": [item["role"][0]["label"] for item in roles],
+        "ner_seconds": ner_seconds,
+        "role_seconds": role_seconds,
+        "ner_mib": weights_mib(ner.model),
+        "role_mib": weights_mib(classifier.model),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ner-model", default="SIRIS-Lab/geordie-ner")
+    parser.add_argument("--role-model", default="SIRIS-Lab/geordie-role")
+    parser.add_argument("--tiny", action="store_true", help="Use tiny random models instead (no download).")
+    parser.add_argument("--gold", help="JSONL annotations (default: the example abstracts, fp32 as reference).")
+    parser.add_argument("--copies", type=int, default=3, help="Times the texts are repeated for timing.")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, help="torch intra-op threads.")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    if args.gold:
+        texts, gold = load_gold(args.gold)
+    else:
+        texts, gold = load_examples(), None
+    texts = texts * args.copies
+    gold = gold * args.copies if gold else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models = build_tiny_models(tmp) if args.tiny else {"ner": args.ner_model, "role": args.role_model}
+        fp32 = run("fp32", models, texts, gold, args.batch_size)
+        # Without gold, int8 classifies the mentions found by fp32
+        int8 = run("int8", models, texts, gold or fp32["entities"], args.batch_size)
+
+    if gold:
+        gold_spans = [{(e["start"], e["end"]) for e in entities} for entities in gold]
+        gold_roles = [e.get("role") for entities in gold for e in entities]
+        scored = [i for i, role in enumerate(gold_roles) if role is not None]
+        scores = {}
+        for name, result in (("fp32", fp32), ("int8", int8)):
+            predicted = [{(start, end) for start, end, _ in spans} for spans in result["spans"]]
+            scores[name] = (
+                f1(gold_spans, predicted),
+                accuracy([gold_roles[i] for i in scored], [result["roles"][i] for i in scored]),
+            )
+    else:
+        scores = {"fp32": (1.0, 1.0), "int8": (f1(fp32["spans"], int8["spans"]), accuracy(fp32["roles"], int8["roles"]))}
+
+    reference = "gold annotations" if gold else "fp32 predictions"
+    print(f"{len(texts)} texts, {sum(len(s) for s in fp32['spans'])} fp32 entities, {len(fp32['roles'])} role inputs; scored against {reference}")
+    print(f"{'precision':>9} | {'NER F1':>7} | {'role acc':>8} | {'NER (s)':>7} | {'role (s)':>8} | {'NER MiB':>7} | {'role MiB':>8}")
+    for name, result in (("fp32", fp32), ("int8", int8)):
+        ner_f1, role_accuracy = scores[name]
+        print(
+            f"{name:>9} | {ner_f1:>7.4f} | {role_accuracy:>8.4f} | {result['ner_seconds']:>7.3f} | "
+            f"{result['role_seconds']:>8.3f} | {result['ner_mib']:>7.1f} | {result['role_mib']:>8.1f}"
+        )
+    print(
+        f"{'delta':>9} | {scores['int8'][0] - scores['fp32'][0]:>+7.4f} | {scores['int8'][1] - scores['fp32'][1]:>+8.4f} | "
+        f"{fp32['ner_seconds'] / int8['ner_seconds']:>6.2f}x | {fp32['role_seconds'] / int8['role_seconds']:>7.2f}x | "
+        f"{fp32['ner_mib'] / int8['ner_mib']:>6.2f}x | {fp32['role_mib'] / int8['role_mib']:>7.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
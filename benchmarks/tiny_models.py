@@ -0,0 +1,77 @@
+"""
+Tiny randomly-initialised DistilBERT stand-ins for the geordie NER and role models, for offline benchmarks.
+
+The models have the architecture and heads of SIRIS-Lab/geordie-ner and SIRIS-Lab/geordie-role, with far
+fewer and narrower layers, and a WordPiece vocabulary built from the packaged examples. Their predictions
+are random, so they measure the pipeline's overhead rather than the cost of the real forward pass
+(pass --dim/--layers close to DistilBERT's 768/6 to approach it).
+
+    python -m benchmarks.tiny_models OUTPUT_DIR [--dim 32] [--layers 2]
+"""
+import argparse
+import os
+import re
+
+from geordie import load_examples
+
+NER_LABELS = ["O", "B-GEO", "I-GEO"]
+ROLE_LABELS = ["ORIGIN", "STUDY_AREA", "OTHER"]
+
+
+def build_vocab(texts) -> list[str]:
+    # Whole lowercased words and punctuation, plus every character alone and as a continuation piece
+    text = "\n".join(texts).lower()
+    words = sorted(set(re.findall(r"\w+|[^\w\s]", text)))
+    chars = sorted(c for c in set(text) if not c.isspace())
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words + chars + ["##" + c for c in chars]
+    return list(dict.fromkeys(vocab))
+
+
+def build_tiny_models(directory: str, dim: int = 32, layers: int = 2, heads: int = 2, seed: int = 0) -> dict:
+    """
+    Save a tiny NER model and a tiny role model under directory/ner and directory/role.
+    :return: A dict {"ner": path, "role": path}, to pass as Geordie(ner_model=..., role_model=...).
+    """
+    import torch
+    from transformers import (
+        DistilBertConfig, DistilBertForSequenceClassification, DistilBertForTokenClassification, DistilBertTokenizerFast,
+    )
+
+    torch.manual_seed(seed)
+    vocab = build_vocab(load_examples())
+    paths = {}
+    for name, model_class, labels in [
+        ("ner", DistilBertForTokenClassification, NER_LABELS),
+        ("role", DistilBertForSequenceClassification, ROLE_LABELS),
+    ]:
+        path = os.path.join(directory, name)
+        os.makedirs(path, exist_ok=True)
+        vocab_file = os.path.join(path, "vocab.txt")
+        with open(vocab_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(vocab))
+        DistilBertTokenizerFast(vocab_file=vocab_file).save_pretrained(path)
+        config = DistilBertConfig(
+            vocab_size=len(vocab), dim=dim, hidden_dim=4 * dim, n_layers=layers, n_heads=heads,
+            max_position_embeddings=512,
+            id2label=dict(enumerate(labels)), label2id={label: i for i, label in enumerate(labels)},
+        )
+        model_class(config).save_pretrained(path)
+        paths[name] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--dim", type=int, default=32, help="Hidden size (DistilBERT: 768).")
+    parser.add_argument("--layers", type=int, default=2, help="Transformer layers (DistilBERT: 6).")
+    parser.add_argument("--heads", type=int, default=2, help="Attention heads (DistilBERT: 12).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = build_tiny_models(args.output_dir, args.dim, args.layers, args.heads, args.seed)
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,63 @@
 import os
-import re
-import torch
-import nltk
-from nltk.tokenize import sent_tokenize
+import time
+from bisect import bisect_right
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING
 
 from importlib.resources import files, as_file
 
-from .ner import GeordieNER  # Geo Entity Recognition
-from .disambiguation import EntityLinker  # Disambiguation of entities with WikiData or OpenStreetMaps
-from .role_classification import RoleClassifier  # Role classification of the Geo entity
-from .resources.demonyms_and_adjectives import pattern, base_transformed_dict
+from .batching import token_lengths
+from .metrics import MetricsRegistry
+from .normalisation import normalise_geographical_entity, get_normaliser
+
+# torch, transformers, nltk and geopy are heavy to import: the components below are only imported
+# when a Geordie pipeline is built (or when accessed as geordie.GeordieNER, etc.)
+_LAZY_COMPONENTS = {
+    "GeordieNER": ".ner",  # Geo Entity Recognition
+    "EntityLinker": ".disambiguation",  # Disambiguation of entities with WikiData or OpenStreetMaps
+    "RoleClassifier": ".role_classification",  # Role classification of the Geo entity
+}
+
+if TYPE_CHECKING:
+    from .disambiguation import EntityLinker
 
 
 # --- NLTK: only download if missing (avoid doing work on import) ---
 def _ensure_punkt():
+    import nltk
+
     try:
         nltk.data.find("tokenizers/punkt")
     except LookupError:
         nltk.download("punkt", quiet=True)
 
 
+@lru_cache(maxsize=None)
+def _punkt_tokenizer(language: str):
+    # Loading the Punkt parameters is costly: build one tokenizer per language
+    import nltk
+
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+    except ImportError:
+        # nltk < 3.8.2 ships the pickled Punkt model instead
+        return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+    return PunktTokenizer(language)
+
+
+def _sentence_spans(text: str, language: str = "english"):
+    """
+    Character spans (start, end) of the sentences of a text, as split by nltk's sent_tokenize.
+    """
+    return list(_punkt_tokenizer(language).span_tokenize(text))
+
+
 def get_device():
     """
     Automatically detects whether CUDA is available. If not, defaults to CPU.
     """
+    import torch
+
     if torch.cuda.is_available():
         print("Using CUDA")
         return "cuda"
@@ -33,73 +67,365 @@ def get_device():
 
 
 class Geordie:
-    def __init__(self, device=None, entity_linker: EntityLinker | None = None):
+    def __init__(
+        self,
+        device=None,
+        entity_linker: "EntityLinker | None" = None,
+        context_window: int | None = None,
+        inference_workers: int = 1,
+        metrics: "MetricsRegistry | bool | None" = None,
+        ner_model: str = "SIRIS-Lab/geordie-ner",
+        role_model: str = "SIRIS-Lab/geordie-role",
+        backend: str = "torch",
+        precision: str = "fp32",
+        ner_window_size: int = 512,
+        ner_stride: int | None = 128,
+    ):
         """
         Initialize the Geordie pipeline.
         :param device: (Optional) Specify 'cpu' or 'cuda'. If not provided, it is auto-detected.
         :param entity_linker: (Optional) Inject a pre-configured EntityLinker (e.g., with cache settings).
+        :param context_window: (Optional) Tokens kept on each side of the entity for role classification (e.g. 64).
+            By default the whole sentence is used.
+        :param inference_workers: Threads running model inference for the async API (aprocess_text, aprocess_corpus).
+        :param metrics: (Optional) A MetricsRegistry (or True for a new one) recording the wall time, items and
+            tokens of each stage (ner, context, linking, role) and the latency of each document. Counting tokens
+            takes an extra tokenizer pass, so it is disabled by default. Export with self.metrics.to_prometheus().
+        :param ner_model: Hugging Face model id or local directory of the NER model.
+        :param role_model: Hugging Face model id or local directory of the role classification model.
+        :param backend: "torch", or "onnx" to run both models with ONNX Runtime (requires geordie[onnx]). The
+            models are exported on first use and cached in ~/.cache/geordie/onnx (or $GEORDIE_ONNX_CACHE).
+        :param precision: "fp32", or "int8" to apply dynamic quantization to the linear layers of both models
+            (CPU only, torch backend). See benchmarks/quantization.py for its effect on accuracy and speed.
+        :param ner_window_size: Maximum tokens per NER forward pass. Longer texts are split into windows.
+        :param ner_stride: Tokens shared by consecutive NER windows (None truncates long texts instead).
         """
+        self.inference_workers = inference_workers
+        self.metrics = MetricsRegistry() if metrics is True else (metrics or None)
+        if self.metrics is not None:
+            _describe_metrics(self.metrics)
+        self._executor = None
+        from .ner import GeordieNER
+        from .disambiguation import EntityLinker
+        from .role_classification import RoleClassifier
+
         _ensure_punkt()
 
         # If no device is passed, it will auto-detect using get_device
         self.device = device or get_device()
 
         # Pass the device to each of the components
-        self.ner = GeordieNER(self.device)
+        self.ner = GeordieNER(
+            self.device, model_name=ner_model, backend=backend, precision=precision,
+            window_size=ner_window_size, stride=ner_stride,
+        )
         self.entity_linker = entity_linker or EntityLinker(self.device)
-        self.entity_classifier = RoleClassifier(self.device)
+        self.entity_classifier = RoleClassifier(
+            self.device, context_window=context_window, model_name=role_model, backend=backend,
+            precision=precision,
+        )
 
     def normalise_geographical_entity(self, entity: str) -> str:
-        # Use re.sub to replace matches with full names (exact adjectives)
-        entity = re.sub(
-            pattern,
-            lambda match: base_transformed_dict.get(match.group(0), match.group(0)),
-            entity,
-            flags=re.IGNORECASE,
-        )
-        return entity
+        # Replace demonyms, adjectives and country codes with full country names
+        return normalise_geographical_entity(entity)
 
     def get_context_of_the_mention(self, text: str, entities):
         results = []
         if len(entities) > 0:
-            # Split text into sentences
-            sentences = sent_tokenize(text)
+            # Split text into sentences once, keeping their character spans
+            spans = _sentence_spans(text)
+            sentence_starts = [start for start, _ in spans]
 
             # Extract sentences containing entities
             for entity in entities:
                 word = entity["word"]
                 start_pos = entity["start"]
+                if word.startswith("##"):
+                    continue
 
                 # Find the sentence that contains the entity based on its start position
-                for sentence in sentences:
-                    s_idx = text.find(sentence)
-                    if s_idx <= start_pos < s_idx + len(sentence):
-                        if not word.startswith("##"):
-                            sentence_marked = sentence.replace(word, f"[START_ENT] {word} [END_ENT]")
-                            word_normalised = self.normalise_geographical_entity(word)
-                            results.append(
-                                {
-                                    "context": sentence_marked.strip(),
-                                    "entity": word,
-                                    "entity_normalised": word_normalised,
-                                }
-                            )
-                            # Stop after first matching sentence; usually first mention carries the relation
-                            break
+                idx = bisect_right(sentence_starts, start_pos) - 1
+                if idx < 0 or start_pos >= spans[idx][1]:
+                    continue
+                s_start, s_end = spans[idx]
+                end_pos = min(entity["end"], s_end)
+
+                # Mark this mention by its offsets (not every occurrence of the word in the sentence)
+                sentence_marked = (
+                    f"{text[s_start:start_pos]}[START_ENT] {text[start_pos:end_pos]} [END_ENT]{text[end_pos:s_end]}"
+                )
+                word_normalised = self.normalise_geographical_entity(word)
+                results.append(
+                    {
+                        "context": sentence_marked.strip(),
+                        "entity": word,
+                        "entity_normalised": word_normalised,
+                    }
+                )
         return results
 
-    def process_text(self, text: str):
-        # Example flow: NER -> Entity Linking -> Entity Classification
-        entities = self.ner.extract_entities(text)
+    # ---------------- Instrumentation ----------------
+    def _observe_stage(self, stage: str, seconds: float, items: int, tokens=None) -> None:
+        self.metrics.observe("geordie_stage_seconds", seconds, stage=stage)
+        self.metrics.incr("geordie_stage_items_total", items, stage=stage)
+        if tokens is not None:
+            self.metrics.incr("geordie_stage_tokens_total", tokens(), stage=stage)
+
+    def _timed(self, stage: str, function, *args, nested: bool = False, tokens=None):
+        # Run a stage, recording its wall time, the items it returns (summed over texts when nested)
+        # and, if given, the tokens it processed (a callable, only evaluated when metrics are enabled)
+        if self.metrics is None:
+            return function(*args)
+        start = time.perf_counter()
+        result = function(*args)
+        items = sum(len(r) for r in result) if nested else len(result)
+        self._observe_stage(stage, time.perf_counter() - start, items, tokens)
+        return result
+
+    def _observe_documents(self, count: int, seconds: float, per_document: bool) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.incr("geordie_documents_total", count)
+        self.metrics.observe("geordie_document_seconds" if per_document else "geordie_batch_seconds", seconds)
+
+    def _ner_tokens(self, texts):
+        return lambda: sum(self.ner.token_lengths(texts))
+
+    def _role_tokens(self, items):
+        # Tokens of the contexts as the model sees them (trimmed to the context window)
+        classifier = self.entity_classifier
+        return lambda: sum(
+            token_lengths(classifier.tokenizer, classifier.trim_contexts([item["context"] for item in items]))
+        )
 
+    # ---------------- Pipeline ----------------
+    def _extract_mentions(self, text: str):
+        entities = self._timed("ner", self.ner.extract_entities, text, tokens=self._ner_tokens([text]))
         # Get sentences of the mentions
-        entities_in_sentence = self.get_context_of_the_mention(text, entities)
-        linked_entities = self.entity_linker.link_entities(entities_in_sentence)
+        return self._timed("context", self.get_context_of_the_mention, text, entities)
+
+    def process_text(self, text: str):
+        # Example flow: NER -> Entity Linking -> Entity Classification
+        start = time.perf_counter()
+        entities_in_sentence = self._extract_mentions(text)
+        linked_entities = self._timed("linking", self.entity_linker.link_entities, entities_in_sentence)
 
         # Classify context
-        classify_context = self.entity_classifier.classify_role(linked_entities)
+        classify_context = self._timed(
+            "role", self.entity_classifier.classify_role, linked_entities, tokens=self._role_tokens(linked_entities)
+        )
+        self._observe_documents(1, time.perf_counter() - start, per_document=True)
         return classify_context
 
+    def process_corpus(self, texts, batch_size: int = 8, role_batch_size: int | None = None):
+        """
+        Process a corpus of texts, batching the model stages across documents.
+        :param texts: An iterable of texts.
+        :param batch_size: Number of texts per NER forward pass.
+        :param role_batch_size: (Optional) Number of mentions per role forward pass (defaults to the
+            RoleClassifier's batch_size).
+        :return: A list with the results of each text, in input order (same format as process_text).
+        """
+        start = time.perf_counter()
+        texts = list(texts)
+        mentions_per_text = self._extract_mentions_from_corpus(texts, batch_size)
+        all_mentions = [item for mentions in mentions_per_text for item in mentions]
+
+        # Each distinct entity of the corpus is geocoded once
+        linked_entities = self._timed("linking", self.entity_linker.link_corpus, all_mentions)
+        classified = self._timed(
+            "role", self.entity_classifier.classify_role_from_corpus, linked_entities, role_batch_size,
+            tokens=self._role_tokens(linked_entities),
+        )
+        self._observe_documents(len(texts), time.perf_counter() - start, per_document=False)
+        return _regroup(classified, mentions_per_text)
+
+    def process_stream(
+        self,
+        texts,
+        batch_size: int = 8,
+        max_in_flight: int | None = None,
+        queue_size: int = 2,
+        key=None,
+        role_batch_size: int | None = None,
+    ):
+        """
+        Process a stream of texts of any size with bounded memory, yielding the results of each text as soon
+        as its batch is done. NER, entity linking and role classification run in their own threads connected
+        by bounded queues, so geocoding overlaps with model inference. See geordie.readers for lazy readers.
+        :param texts: An iterable of texts, read lazily (e.g. geordie.readers.read_texts("corpus.jsonl")).
+        :param batch_size: Number of texts per batch (and per NER forward pass).
+        :param max_in_flight: Maximum number of texts read but whose results are not yet yielded
+            (default: 4 * batch_size; ValueError if below batch_size). Reading pauses when it is reached.
+        :param queue_size: Batches buffered between consecutive stages.
+        :param key: (Optional) Function returning the text of each input item, e.g. operator.itemgetter("text")
+            for JSONL records. The results are then yielded as (item, results) pairs, keeping each record
+            next to its results.
+        :param role_batch_size: (Optional) Number of mentions per role forward pass (defaults to the
+            RoleClassifier's batch_size).
+        :return: An iterator over the results of each text, in input order (same format as process_text).
+        """
+        from .streaming import stream_batches
+
+        def extract(items):
+            texts = [key(item) for item in items] if key is not None else items
+            return items, self._extract_mentions_from_corpus(texts, batch_size)
+
+        def link(extracted):
+            items, mentions_per_text = extracted
+            all_mentions = [item for mentions in mentions_per_text for item in mentions]
+            return items, mentions_per_text, self._timed("linking", self.entity_linker.link_corpus, all_mentions)
+
+        def classify(linked):
+            items, mentions_per_text, linked_entities = linked
+            classified = self._timed(
+                "role", self.entity_classifier.classify_role_from_corpus, linked_entities, role_batch_size,
+                tokens=self._role_tokens(linked_entities),
+            )
+            results = _regroup(classified, mentions_per_text)
+            return list(zip(items, results)) if key is not None else results
+
+        return stream_batches(
+            texts,
+            [extract, link, classify],
+            batch_size=batch_size,
+            max_in_flight=max_in_flight or 4 * batch_size,
+            queue_size=queue_size,
+        )
+
+    def process_corpus_parallel(self, texts, workers: int | None = None, batch_size: int = 8, torch_threads: int = 1):
+        """
+        Process a corpus with worker processes forked from this one, sharing the model weights copy-on-write.
+        See geordie.parallel.process_corpus_parallel for the other options and caveats.
+        :param texts: An iterable of texts (read lazily).
+        :param workers: Number of worker processes (default: os.cpu_count() // torch_threads).
+        :param batch_size: Number of texts per NER forward pass in each worker.
+        :param torch_threads: torch intra-op threads per worker.
+        :return: An iterator over the results of each text, in input order.
+        """
+        from .parallel import process_corpus_parallel
+        return process_corpus_parallel(
+            self, texts, workers=workers, batch_size=batch_size, torch_threads=torch_threads
+        )
+
+    def _extract_mentions_from_corpus(self, texts: list, batch_size: int):
+        # NER over batches of texts, then the marked mentions of every text
+        entities_per_text = self._timed(
+            "ner", self.ner.extract_entities_from_corpus, texts, batch_size, nested=True, tokens=self._ner_tokens(texts)
+        )
+        return self._timed(
+            "context",
+            lambda: [self.get_context_of_the_mention(text, entities) for text, entities in zip(texts, entities_per_text)],
+            nested=True,
+        )
+
+    # ---------------- Async API ----------------
+    async def _run_inference(self, function, *args):
+        # Run a model stage in the bounded inference executor without blocking the event loop
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.inference_workers, thread_name_prefix="geordie")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def aprocess_text(self, text: str):
+        """
+        Asyncio version of process_text: models run in the inference executor and geocoding awaits Nominatim.
+        """
+        start = time.perf_counter()
+        entities_in_sentence = await self._run_inference(self._extract_mentions, text)
+        linked_entities = await self._alink(entities_in_sentence)
+        classified = await self._run_inference(
+            partial(self._timed, "role", self.entity_classifier.classify_role, linked_entities,
+                    tokens=self._role_tokens(linked_entities))
+        )
+        self._observe_documents(1, time.perf_counter() - start, per_document=True)
+        return classified
+
+    async def _alink(self, entities_in_sentence):
+        start = time.perf_counter()
+        linked_entities = await self.entity_linker.alink_entities(entities_in_sentence)
+        if self.metrics is not None:
+            self._observe_stage("linking", time.perf_counter() - start, len(linked_entities))
+        return linked_entities
+
+    async def aprocess_corpus(
+        self, texts, batch_size: int = 8, max_concurrency: int = 4, role_batch_size: int | None = None
+    ):
+        """
+        Asyncio version of process_corpus. Texts are processed in batches of batch_size, with up to
+        max_concurrency batches in flight, so model inference overlaps with waiting on Nominatim.
+        :param texts: An iterable of texts.
+        :param batch_size: Number of texts per batch (and per NER forward pass).
+        :param max_concurrency: Maximum number of batches in flight.
+        :param role_batch_size: (Optional) Number of mentions per role forward pass (defaults to the
+            RoleClassifier's batch_size).
+        :return: A list with the results of each text, in input order.
+        """
+        import asyncio
+
+        texts = list(texts)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process_batch(batch):
+            async with semaphore:
+                start = time.perf_counter()
+                mentions_per_text = await self._run_inference(self._extract_mentions_from_corpus, batch, batch_size)
+                all_mentions = [item for mentions in mentions_per_text for item in mentions]
+                linked_entities = await self._alink(all_mentions)
+                classified = await self._run_inference(
+                    partial(self._timed, "role", self.entity_classifier.classify_role_from_corpus, linked_entities,
+                            role_batch_size, tokens=self._role_tokens(linked_entities))
+                )
+                self._observe_documents(len(batch), time.perf_counter() - start, per_document=False)
+                return _regroup(classified, mentions_per_text)
+
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(process_batch(batch) for batch in batches))
+        return [result for batch_results in results for result in batch_results]
+
+    async def aclose(self):
+        """
+        Release the resources of the async API (inference threads, geocoding HTTP session).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        await self.entity_linker.aclose()
+
+
+def _describe_metrics(metrics: MetricsRegistry) -> None:
+    metrics.describe("geordie_stage_seconds", "Wall time of a pipeline stage call (one document, or a batch in corpus mode).")
+    metrics.describe("geordie_stage_items_total", "Items output by a stage: entities (ner) or mentions (context, linking, role).")
+    metrics.describe("geordie_stage_tokens_total", "Tokens fed to the model of a stage (ner, role).")
+    metrics.describe("geordie_documents_total", "Documents processed.")
+    metrics.describe("geordie_document_seconds", "End-to-end wall time per document (process_text, aprocess_text).")
+    metrics.describe("geordie_batch_seconds", "End-to-end wall time per batch of documents (process_corpus, aprocess_corpus).")
+
+
+def _regroup(classified: list, mentions_per_text: list):
+    # Split the flat list of mentions back per text
+    results = []
+    offset = 0
+    for mentions in mentions_per_text:
+        results.append(classified[offset:offset + len(mentions)])
+        offset += len(mentions)
+    return results
+
+
+def __getattr__(name):
+    if name in _LAZY_COMPONENTS:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_COMPONENTS[name], __name__), name)
+    # Lookup tables formerly imported eagerly from resources.demonyms_and_adjectives
+    if name == "base_transformed_dict":
+        return get_normaliser().replacements
+    if name == "pattern":
+        from .resources.demonyms_and_adjectives import pattern
+        return pattern
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ----------------------
 # Resource-aware helpers
@@ -158,13 +484,34 @@ def run_example():
     return result
 
 
-def run_corpus(corpus=None):
+def run_corpus(corpus=None, batch_size: int = 8, workers: int = 1):
     corpus = corpus or load_examples()
     geordie = Geordie()
-    results = []
-
-    for text in corpus:
-        results.append(geordie.process_text(text))
+    if workers > 1:
+        results = list(geordie.process_corpus_parallel(corpus, workers=workers, batch_size=batch_size))
+    else:
+        results = geordie.process_corpus(corpus, batch_size=batch_size)
 
     print(f"Results for corpus of texts:\n{results}")
     return results
+
+
+def run_stream(input_path: str, output_path: str, field: str = "text", batch_size: int = 8, max_in_flight=None):
+    """
+    Process a corpus file to a JSONL file with bounded memory. Each output line is the input record (or
+    {field: line} for line-delimited text) with its results under "geordie".
+    :param input_path: A JSONL file (.jsonl, .jsonl.gz) or a text file with one document per line ("-" for stdin).
+    :param output_path: The output JSONL file ("-" for stdout).
+    :param field: Key of the text in JSONL records.
+    :return: Number of documents processed.
+    """
+    from operator import itemgetter
+    from .readers import read_jsonl_records, read_lines, write_jsonl
+
+    if str(input_path).endswith((".jsonl", ".jsonl.gz")):
+        records = read_jsonl_records(input_path)
+    else:
+        records = ({field: line} for line in read_lines(input_path))
+    geordie = Geordie()
+    results = geordie.process_stream(records, batch_size=batch_size, max_in_flight=max_in_flight, key=itemgetter(field))
+    return write_jsonl(output_path, ({**record, "geordie": result} for record, result in results))
@@ -0,0 +1,61 @@
+def token_lengths(tokenizer, texts, stride: int | None = None):
+    """
+    Tokenized length of each text (special tokens included, capped at the model max length).
+    :param tokenizer: A Hugging Face tokenizer.
+    :param texts: A list of texts.
+    :param stride: (Optional) Tokens shared by consecutive windows. Texts longer than the max length are then
+        not capped: they count the tokens of all the overlapping windows they are split into (fast tokenizer).
+    :return: A list with the number of tokens of each text.
+    """
+    if not texts:
+        return []
+    if stride is None:
+        encoded = tokenizer(list(texts), add_special_tokens=True, truncation=True)
+        return [len(ids) for ids in encoded["input_ids"]]
+    encoded = tokenizer(
+        list(texts), add_special_tokens=True, truncation=True, stride=stride, return_overflowing_tokens=True
+    )
+    lengths = [0] * len(texts)
+    for index, ids in zip(encoded["overflow_to_sample_mapping"], encoded["input_ids"]):
+        lengths[index] += len(ids)
+    return lengths
+
+
+def length_sorted_order(lengths):
+    """
+    Order of the inputs sorted by length, so that consecutive batches hold inputs of similar size.
+    :param lengths: A list with the length of each input.
+    :return: A list of input indices.
+    """
+    return sorted(range(len(lengths)), key=lengths.__getitem__)
+
+
+def restore_order(outputs, order):
+    """
+    Put the outputs computed for the inputs in `order` back in the original input order.
+    :param outputs: Outputs aligned with `order`.
+    :param order: The permutation used to build the batches (see length_sorted_order).
+    :return: A list with the outputs in input order.
+    """
+    restored = [None] * len(order)
+    for position, index in enumerate(order):
+        restored[index] = outputs[position]
+    return restored
+
+
+def padding_stats(lengths, batch_size, order=None):
+    """
+    Count real and padded tokens when the inputs are batched in `order` and each batch is padded to its longest input.
+    :param lengths: A list with the length of each input.
+    :param batch_size: Number of inputs per batch.
+    :param order: (Optional) Order in which inputs are batched. Defaults to the input order.
+    :return: A dict with 'real_tokens', 'padded_tokens' (total after padding) and 'waste' (fraction of padding).
+    """
+    order = list(range(len(lengths))) if order is None else order
+    real_tokens = sum(lengths)
+    padded_tokens = 0
+    for i in range(0, len(order), batch_size):
+        batch = [lengths[index] for index in order[i:i + batch_size]]
+        padded_tokens += max(batch) * len(batch)
+    waste = (padded_tokens - real_tokens) / padded_tokens if padded_tokens else 0.0
+    return {"real_tokens": real_tokens, "padded_tokens": padded_tokens, "waste": waste}
@@ -0,0 +1,261 @@
+"""
+Cache backends for EntityLinker.
+
+Keys are the strings built by EntityLinker._make_key and values are the dicts stored per entity
+({"osm": ..., "osm_raw": ...}). A backend returns None for a missing or expired key.
+
+EntityLinker keeps values frozen (see freeze), so they can be handed out to every caller without copying.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict. Still a dict for isinstance checks, json.dumps and pickle, but any mutation raises TypeError.
+    """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached geocoding results are read-only; use EntityLinker(mutable_results=True) to get copies")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value):
+    """
+    Immutable version of a JSON-like value: dicts become FrozenDict and lists become tuples, recursively.
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """
+    Mutable copy of a frozen value: FrozenDict becomes dict and tuples become lists, recursively.
+    """
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+# Approximate per-entry overhead of the OrderedDict (hash table slot and linked-list node) and the (ts, value) tuple
+_ENTRY_OVERHEAD = sys.getsizeof((0.0, None)) + 100
+
+
+def estimate_size(value, _seen=None) -> int:
+    """
+    Approximate memory footprint of a JSON-like value in bytes (containers, keys and leaves).
+    Objects shared within the value are counted once.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, seen) + estimate_size(v, seen)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            size += estimate_size(v, seen)
+    return size
+
+
+class CacheBackend:
+    """
+    Interface of a geocode cache backend.
+    """
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value) -> None:
+        raise NotImplementedError
+
+    def get_many(self, keys) -> dict:
+        """
+        Look up several keys at once. Returns {key: value} for the keys found.
+        """
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """
+    In-memory LRU cache with optional TTL, safe to share between threads.
+    - LRU eviction when the cache exceeds maxsize entries or, optionally, max_bytes (approximate size
+      of keys and values, see estimate_size). Either bound can be None.
+    - Optional TTL so entries expire after some seconds (set ttl=None to disable).
+    """
+    def __init__(self, maxsize: Optional[int] = 5000, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # simple LRU via OrderedDict: {key: (timestamp, value)}
+        self._data: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        # estimated size of each entry, and their total
+        self._sizes: dict[str, int] = {}
+        self.nbytes = 0
+        # entries dropped by LRU eviction and by TTL expiry
+        self.evictions = 0
+        self.expiries = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._data:
+                return None
+            ts, value = self._data[key]
+            # TTL check
+            if self.ttl is not None and (time.time() - ts) > self.ttl:
+                # expired
+                self._remove(key)
+                self.expiries += 1
+                return None
+            # refresh LRU order
+            self._data.move_to_end(key, last=True)
+            return value
+
+    def _remove(self, key: str) -> None:
+        del self._data[key]
+        self.nbytes -= self._sizes.pop(key)
+
+    def set(self, key: str, value) -> None:
+        size = _ENTRY_OVERHEAD + estimate_size(key) + estimate_size(value)
+        with self._lock:
+            # evict if needed (an existing key is replaced, not evicted)
+            if key in self._data:
+                self._remove(key)
+            while self._data and (
+                (self.maxsize is not None and len(self._data) >= self.maxsize)
+                or (self.max_bytes is not None and self.nbytes + size > self.max_bytes)
+            ):
+                self._remove(next(iter(self._data)))  # pop oldest (LRU)
+                self.evictions += 1
+            self._data[key] = (time.time(), value)
+            self._sizes[key] = size
+            self.nbytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.evictions = 0
+            self.expiries = 0
+
+    def memory_usage(self) -> dict:
+        """
+        Entries and estimated bytes held, with the configured bounds.
+        """
+        return {"entries": len(self._data), "bytes": self.nbytes, "maxsize": self.maxsize, "max_bytes": self.max_bytes}
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent cache in a SQLite file, shared by processes on the same machine.
+    - Values are stored as JSON, negative results included.
+    - Optional TTL checked on read (set ttl=None to disable).
+    - WAL journal and a busy timeout so several worker processes can read and write the same file.
+    """
+    def __init__(self, path: str, ttl: Optional[float] = None, timeout: float = 30.0):
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+        # One connection per process and thread: sqlite3 connections cannot be shared across them
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache (key TEXT PRIMARY KEY, ts REAL NOT NULL, value TEXT)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _expired(self, ts: float) -> bool:
+        return self.ttl is not None and (time.time() - ts) > self.ttl
+
+    def get(self, key: str):
+        row = self._connection().execute("SELECT ts, value FROM geocode_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or self._expired(row[0]):
+            return None
+        return json.loads(row[1])
+
+    def get_many(self, keys) -> dict:
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        conn = self._connection()
+        # Stay below SQLite's limit of host parameters per statement
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT key, ts, value FROM geocode_cache WHERE key IN ({placeholders})", chunk)
+            for key, ts, value in rows:
+                if not self._expired(ts):
+                    found[key] = json.loads(value)
+        return found
+
+    def set(self, key: str, value) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: dict) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO geocode_cache (key, ts, value) VALUES (?, ?, ?)",
+                [(key, now, json.dumps(value)) for key, value in items.items()],
+            )
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM geocode_cache")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -1,12 +1,19 @@
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderServiceError, GeocoderTimedOut
+import asyncio
+import threading
 import time
 import os
-import copy
+import json
 import logging
+import pickle
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
-from collections import OrderedDict
-import pandas as pd
+
+from .cache import CacheBackend, LRUCache, estimate_size, freeze, thaw
+from .metrics import Counters, Histogram
+from .ratelimit import TokenBucket
 
 # from .utils import cache_new_results
 
@@ -15,13 +22,38 @@ address_keys_to_extract = ["municipality", "city", "town", "village", "county",
 extratags_keys_to_extract = ["wikidata", "wikipedia"] 
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
+static_cache_path = os.path.join(script_dir, "data", "static_cache.pkl")
+# Query parameters the bundled static_cache.pkl was recorded with
+static_cache_params = {"language": "en", "addressdetails": True, "extratags": True}
 
 class EntityLinker:
     """
     Entity linker with in-memory LRU cache for Nominatim geocoding.
-    - Caches both positive and negative results (None) per entity string and query params.
+    - Caches both positive and negative results (None) per entity string and query params. Negatives caused
+      by Nominatim errors (timeouts, rate limiting, 5xx) stay in memory and are never persisted.
     - Optional TTL so entries expire after some seconds (set cache_ttl=None to disable).
-    - LRU eviction when cache exceeds cache_maxsize.
+    - LRU eviction when cache exceeds cache_maxsize entries or, optionally, cache_max_bytes (approximate);
+      see cache_memory().
+    - Optional persistent cache_backend (e.g. SQLiteCache) behind the LRU, shared across processes and runs.
+    - Read-only static tier of raw Nominatim records consulted before everything else: the bundled
+      data/static_cache.pkl by default, or a larger snapshot of your own ({entity: raw record or None},
+      as a dict or a .pkl/.json file recorded with the same query parameters as the linker).
+    - Nominatim calls are rate limited with a token bucket: requests_per_second (default 1 / sleep_between_calls),
+      with up to max_workers lookups in flight at once across all callers, on long-lived lookup threads
+      (useful against a self-hosted Nominatim; close() stops them).
+    - alink_entities is the asyncio counterpart of link_entities (geopy's aiohttp adapter), sharing the
+      same caches and rate limiter.
+    - Safe to share between threads (or tasks): concurrent lookups of the same key are coalesced, so only
+      the first caller queries Nominatim and the others wait for its result.
+    - Cached values are stored frozen (read-only dicts and tuples) and attached to items without copying;
+      pass mutable_results=True to get a private, mutable copy on every item instead.
+    - raw_payloads controls the full Nominatim record ('osm_raw'): "keep" it on every item and cache entry,
+      "drop" it (only the compact 'osm' subset is kept), or "ref": store it once per place_id in raw_store
+      and attach 'osm_raw_ref'. The default raw_store is an LRUCache of up to cache_maxsize records that
+      shares cache_max_bytes with the cache (half each), so the two stay within the one budget; get_raw
+      returns None for records it evicted. Pass any mapping (e.g. a shelve for on-disk storage, or a dict
+      to keep every record) to keep them all, outside the budget. Raw records of the static tier are kept
+      in memory with it.
     """
     def __init__(
         self,
@@ -29,24 +61,75 @@ class EntityLinker:
         user_agent: str = "siris_app",
         cache_maxsize: int = 5000,
         cache_ttl: Optional[float] = None,   # e.g. 86400 for 1 day
+        cache_max_bytes: Optional[int] = None,  # e.g. 256 * 2**20 for 256 MiB
         importance_threshold: float = 0.0,
         language: str = "en",
         addressdetails: bool = True,
         extratags: bool = True,
-        sleep_between_calls: float = 3
+        sleep_between_calls: float = 3,
+        cache_backend: CacheBackend | None = None,
+        static_cache: bool | str | dict = True,
+        requests_per_second: Optional[float] = None,
+        max_workers: int = 1,
+        mutable_results: bool = False,
+        raw_payloads: str = "keep",
+        raw_store=None,
     ):
         self.device = device
+        self.user_agent = user_agent
         self.app = Nominatim(user_agent=user_agent)
         self.cache_maxsize = cache_maxsize
         self.cache_ttl = cache_ttl
+        self.cache_max_bytes = cache_max_bytes
         self.importance_threshold = importance_threshold
         self.language = language
         self.addressdetails = addressdetails
         self.extratags = extratags
-        # simple LRU via OrderedDict: {key: (timestamp, value)}
-        self._cache: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        if raw_payloads not in ("keep", "drop", "ref"):
+            raise ValueError(f"raw_payloads must be 'keep', 'drop' or 'ref', not {raw_payloads!r}")
+        self.raw_payloads = raw_payloads
+        # Raw records by str(place_id) when raw_payloads="ref". The default in-memory store takes half of
+        # cache_max_bytes, so the cache and the raw records together stay within the configured budget.
+        cache_bytes = cache_max_bytes
+        if raw_store is None:
+            raw_bytes = None
+            if raw_payloads == "ref" and cache_max_bytes is not None:
+                raw_bytes = cache_max_bytes // 2
+                cache_bytes = cache_max_bytes - raw_bytes
+            raw_store = LRUCache(maxsize=cache_maxsize, ttl=cache_ttl, max_bytes=raw_bytes)
+        self.raw_store = raw_store
+        self._cache = LRUCache(maxsize=cache_maxsize, ttl=cache_ttl, max_bytes=cache_bytes)
+        self.cache_backend = cache_backend
         self._logger = logging.getLogger(__name__)
         self._sleep = sleep_between_calls
+        if requests_per_second is None and sleep_between_calls:
+            requests_per_second = 1 / sleep_between_calls
+        self.requests_per_second = requests_per_second
+        self.max_workers = max_workers
+        self.mutable_results = mutable_results
+        self._rate_limiter = TokenBucket(requests_per_second)
+        # In-flight lookups by key, so concurrent callers share one Nominatim call
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Lookup threads and slots shared by all callers, so max_workers bounds the lookups in flight overall
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+        self._lookup_slots = threading.BoundedSemaphore(max(1, max_workers))
+        # Async geocoder and in-flight lookups, bound to the event loop they were created in
+        self._async_app = None
+        self._async_loop = None
+        self._ainflight: dict[str, asyncio.Future] = {}
+        self._alookup_slots: asyncio.Semaphore | None = None
+        self._alookup_loop = None
+        # Summary of the last link_corpus call
+        self.last_link_report: dict | None = None
+        # Cache effectiveness and Nominatim timing, see stats()
+        self._counters = Counters()
+        self._geocode_latency = Histogram()
+        # Raw records of the static tier (raw_payloads="ref"), kept with it rather than in the bounded raw_store
+        self._static_raw: dict = {}
+        self._static = self._load_static_cache(static_cache)
 
     # ---------------- Cache helpers ----------------
     def _make_key(self, entity: str) -> str:
@@ -54,116 +137,529 @@ class EntityLinker:
         e = (entity or "").strip().lower()
         return f"{e}||lang={self.language}|addr={int(self.addressdetails)}|extra={int(self.extratags)}"
 
-    def _cache_get(self, key: str):
-        if key not in self._cache:
-            return None
-        ts, value = self._cache[key]
-        # TTL check
-        if self.cache_ttl is not None and (time.time() - ts) > self.cache_ttl:
-            # expired
-            try:
-                del self._cache[key]
-            except KeyError:
-                pass
+    def _load_static_cache(self, static_cache) -> dict:
+        # Build {key: cache value} from a snapshot of raw Nominatim records
+        if static_cache is True:
+            params = {"language": self.language, "addressdetails": self.addressdetails, "extratags": self.extratags}
+            if params != static_cache_params:
+                # The bundled records would not match what Nominatim returns for these parameters
+                return {}
+            static_cache = static_cache_path
+        if not static_cache:
+            return {}
+        if isinstance(static_cache, dict):
+            records = static_cache
+        elif str(static_cache).endswith(".json"):
+            with open(static_cache, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        else:
+            with open(static_cache, "rb") as f:
+                records = pickle.load(f)
+        return {
+            self._make_key(entity): freeze(self._to_cache_value(raw, raw_store=self._static_raw))
+            for entity, raw in records.items()
+        }
+
+    def _to_cache_value(self, result_osm: dict | None, raw_store=None) -> dict:
+        # Cache value for a raw Nominatim record (or None), following the raw_payloads policy
+        value = self._build_cache_value(result_osm)
+        if self.raw_payloads == "keep":
+            return value
+        raw = value["osm_raw"]
+        value["osm_raw"] = None
+        if self.raw_payloads == "ref":
+            place_id = raw.get("place_id") if raw is not None else None
+            raw_store = self.raw_store if raw_store is None else raw_store
+            if place_id is not None:
+                if isinstance(raw_store, CacheBackend):
+                    raw_store.set(str(place_id), freeze(raw))
+                else:
+                    raw_store[str(place_id)] = freeze(raw)
+            value["osm_raw_ref"] = place_id
+        return value
+
+    def get_raw(self, item_or_place_id):
+        """
+        Full Nominatim record of a linked item (or a place_id) when raw_payloads="ref".
+        :return: The raw record, or None if it is not (or no longer) in raw_store.
+        """
+        place_id = item_or_place_id.get("osm_raw_ref") if isinstance(item_or_place_id, dict) else item_or_place_id
+        if place_id is None:
             return None
-        # refresh LRU order
-        self._cache.move_to_end(key, last=True)
-        # return a deep copy to avoid callers mutating cached structures
-        return copy.deepcopy(value)
-
-    def _cache_set(self, key: str, value):
-        # evict if needed
-        while len(self._cache) >= self.cache_maxsize:
-            self._cache.popitem(last=False)  # pop oldest (LRU)
-        self._cache[key] = (time.time(), copy.deepcopy(value))
-        self._cache.move_to_end(key, last=True)
+        if str(place_id) in self._static_raw:
+            return self._static_raw[str(place_id)]
+        return self.raw_store.get(str(place_id))
+
+    def _build_cache_value(self, result_osm: dict | None) -> dict:
+        # {"osm": compact subset, "osm_raw": record}, or a negative result
+        if result_osm is None:
+            return {"osm": None, "osm_raw": None}
+
+        # Filter by importance to avoid low-confidence matches
+        importance = result_osm.get("importance", 0.0) or 0.0
+        if importance < self.importance_threshold:
+            return {"osm": None, "osm_raw": None}
+
+        # Build compact subset
+        subset = {k: result_osm.get(k) for k in keys_to_extract}
+
+        address = result_osm.get("address")
+        if address is not None and isinstance(address, dict) and address:
+            # a rough "entity_type" as the first key in address (kept from your logic)
+            subset["entity_type"] = list(address.keys())[0]
+            address_subset = {k: address.get(k) for k in address_keys_to_extract}
+        else:
+            address_subset = {k: None for k in address_keys_to_extract}
+        subset.update(address_subset)
+
+        extratags = result_osm.get("extratags")
+        if extratags is not None and isinstance(extratags, dict):
+            extratags_subset = {k: extratags.get(k) for k in extratags_keys_to_extract}
+        else:
+            extratags_subset = {k: None for k in extratags_keys_to_extract}
+        subset.update(extratags_subset)
+
+        return {"osm": subset, "osm_raw": result_osm}
+
+    def _cache_get(self, key: str):
+        # Values are frozen, so they are returned without copying
+        tier, value = self._lookup(key)
+        self._count_lookup(tier, value)
+        return value
+
+    def _lookup(self, key: str):
+        # (tier, value) of a key through the static, in-memory and persistent tiers, without counting
+        if key in self._static:
+            tier, value = "static_hits", self._static[key]
+        else:
+            tier, value = "memory_hits", self._cache.get(key)
+            if value is None and self.cache_backend is not None:
+                tier, value = "backend_hits", self.cache_backend.get(key)
+                if value is not None:
+                    # promote to the in-memory tier
+                    value = self._from_backend(value)
+                    self._cache.set(key, value)
+        return tier, value
+
+    def _count_lookup(self, tier: str, value, count: int = 1) -> None:
+        if value is None:
+            self._counters.incr("misses", count)
+        else:
+            self._counters.incr(tier, count)
+            if value["osm"] is None:
+                self._counters.incr("negative_hits", count)
+
+    def _cache_set(self, key: str, value, persist: bool = True):
+        # Store (and return) the frozen value; persist=False keeps it out of the persistent backend
+        value = freeze(value)
+        self._cache.set(key, value)
+        if persist and self.cache_backend is not None:
+            self.cache_backend.set(key, value)
+        return value
+
+    def _from_backend(self, value):
+        # Frozen value read from the persistent backend; entries written with raw_payloads="keep" are slimmed
+        if self.raw_payloads != "keep" and value.get("osm_raw") is not None:
+            value = self._to_cache_value(value["osm_raw"])
+        return freeze(value)
+
+    def _result_value(self, value):
+        # What gets attached to an item: the shared frozen value, or a private mutable copy when requested
+        return thaw(value) if self.mutable_results else value
 
     def clear_cache(self):
+        """
+        Clear the in-memory cache. A persistent cache_backend is left untouched (see its clear()).
+        """
         self._cache.clear()
 
+    def cache_memory(self) -> dict:
+        """
+        Approximate memory used by the in-memory tiers.
+        :return: A dict with the LRU 'entries', 'bytes', 'maxsize' and 'max_bytes', plus 'static_entries',
+            'static_bytes' and, when raw_payloads="ref" with an in-memory raw_store, 'raw_store_entries' and
+            'raw_store_bytes'. With the default raw_store, 'raw_store_max_bytes' is its share of cache_max_bytes:
+            'max_bytes' + 'raw_store_max_bytes' == cache_max_bytes, so 'bytes' + 'raw_store_bytes' stays within it.
+        """
+        usage = self._cache.memory_usage()
+        usage["static_entries"] = len(self._static)
+        usage["static_bytes"] = estimate_size(self._static) + estimate_size(self._static_raw)
+        if self.raw_payloads == "ref" and isinstance(self.raw_store, LRUCache):
+            raw_usage = self.raw_store.memory_usage()
+            usage["raw_store_entries"] = raw_usage["entries"]
+            usage["raw_store_bytes"] = raw_usage["bytes"]
+            usage["raw_store_max_bytes"] = raw_usage["max_bytes"]
+        elif self.raw_payloads == "ref" and isinstance(self.raw_store, dict):
+            usage["raw_store_entries"] = len(self.raw_store)
+            usage["raw_store_bytes"] = estimate_size(self.raw_store)
+        return usage
+
+    def stats(self) -> dict:
+        """
+        Cache and Nominatim metrics since creation (or the last reset_stats()), to size cache_maxsize and cache_ttl.
+        :return: A dict with the lookup counters ('static_hits', 'memory_hits', 'backend_hits', 'negative_hits'
+            (hits on cached "not found" results, included in the hits), 'misses', 'coalesced'), their 'hits',
+            'lookups' and 'hit_ratio', the LRU 'evictions', 'expiries', 'entries' and 'bytes', the Nominatim
+            'geocode_calls', 'geocode_errors', 'network_seconds' and 'rate_limit_wait_seconds' (time spent
+            sleeping in the rate limiter), and 'geocode_latency' (a histogram snapshot, see metrics.Histogram).
+            Lookups are counted per item (mention), by link_entities and link_corpus alike.
+        """
+        stats = {
+            name: 0 for name in (
+                "static_hits", "memory_hits", "backend_hits", "negative_hits", "misses", "coalesced",
+                "geocode_calls", "geocode_errors",
+            )
+        }
+        stats.update(network_seconds=0.0, rate_limit_wait_seconds=0.0)
+        stats.update(self._counters.snapshot())
+        stats["hits"] = stats["static_hits"] + stats["memory_hits"] + stats["backend_hits"]
+        stats["lookups"] = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / stats["lookups"] if stats["lookups"] else None
+        stats["evictions"] = self._cache.evictions
+        stats["expiries"] = self._cache.expiries
+        usage = self._cache.memory_usage()
+        stats["entries"] = usage["entries"]
+        stats["bytes"] = usage["bytes"]
+        stats["geocode_latency"] = self._geocode_latency.snapshot()
+        return stats
+
+    def reset_stats(self) -> dict:
+        """
+        Reset the metrics of stats(), e.g. between reporting intervals.
+        :return: The stats() snapshot taken just before the reset.
+        """
+        snapshot = self.stats()
+        self._counters.reset()
+        self._geocode_latency.reset()
+        self._cache.reset_counters()
+        return snapshot
+
+    def prefetch(self, entities) -> int:
+        """
+        Load the cached results of several entities from the persistent backend into memory in one query.
+        :param entities: An iterable of entity strings.
+        :return: Number of entries loaded. Later lookups of these entries count as memory hits in stats()
+            (link_corpus prefetches on its own and counts them as backend hits).
+        """
+        return len(self._prefetch_keys({self._make_key(entity) for entity in entities}))
+
+    def _prefetch_keys(self, keys) -> dict:
+        # Load the keys missing from the static and in-memory tiers from the backend; return {key: value} found
+        if self.cache_backend is None:
+            return {}
+        keys = [key for key in keys if key not in self._static and key not in self._cache]
+        found = {key: self._from_backend(value) for key, value in self.cache_backend.get_many(keys).items()}
+        for key, value in found.items():
+            self._cache.set(key, value)
+        return found
+
+    # ---------------- Nominatim ----------------
+    def _fetch(self, entity: str):
+        # Rate-limited Nominatim lookup; returns the cache value for the entity and whether it may be persisted
+        # (a negative value on errors, which must not outlive this process)
+        self._counters.incr("rate_limit_wait_seconds", self._rate_limiter.acquire())
+        start = time.perf_counter()
+        try:
+            res = self.app.geocode(
+                entity,
+                addressdetails=self.addressdetails,
+                language=self.language,
+                extratags=self.extratags,
+            )
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            self._logger.warning(f"Nominatim error for '{entity}': {e}")
+            self._counters.incr("geocode_errors")
+            # Negative result, cached in memory only to avoid hammering on repeated failures: a timeout or a
+            # 429/5xx is transient and must not become a lasting "not found" in the persistent backend
+            return self._to_cache_value(None), False
+        finally:
+            self._observe_geocode(time.perf_counter() - start)
+
+        # No result found, or below the importance threshold, gives a negative result
+        return self._to_cache_value(res.raw if res is not None else None), True
+
+    def _observe_geocode(self, seconds: float) -> None:
+        self._counters.incr("geocode_calls")
+        self._counters.incr("network_seconds", seconds)
+        self._geocode_latency.observe(seconds)
+
+    def _claim(self, pending: dict, inflight: dict, new_future):
+        # Split {key: entity} into cache hits, keys this caller must look up (leading) and keys already
+        # being looked up by another caller (following). Runs under the in-flight lock (or on the event loop).
+        resolved, leading, following = {}, {}, {}
+        for key in pending:
+            # Another caller may have resolved it since our first cache check. Their value went to the
+            # in-memory tier, so only that one is checked: the backend must not be queried under the lock.
+            cached = self._cache.get(key)
+            if cached is not None:
+                resolved[key] = cached
+            elif key in inflight:
+                following[key] = inflight[key]
+                self._counters.incr("coalesced")
+            else:
+                inflight[key] = leading[key] = new_future()
+        return resolved, leading, following
+
+    def _resolve(self, key: str, entity: str, future: Future) -> dict:
+        # Look up a key this caller leads, cache the value and hand it to the callers waiting on it
+        try:
+            with self._lookup_slots:
+                fetched, persist = self._fetch(entity)
+            # Store in cache
+            value = self._cache_set(key, fetched, persist)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            self._fail(future, e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    @staticmethod
+    def _fail(future, error: BaseException) -> None:
+        # Hand a failed lookup to the callers coalesced on it
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(error)
+            # The error is re-raised to the leading caller: do not warn when no other caller awaits it
+            future.exception()
+
+    def _abandon(self, leading: dict, inflight: dict, error: BaseException) -> None:
+        # Fail the lookups this caller claimed but never resolved (an earlier one raised, or it was cancelled),
+        # so the callers coalesced on them get the error instead of waiting forever
+        for key, future in leading.items():
+            if not future.done():
+                self._fail(future, error)
+                inflight.pop(key, None)
+
+    def _fetch_many(self, pending: dict) -> dict:
+        # Look up {key: entity} on Nominatim (concurrently if max_workers > 1) and cache the results
+        with self._inflight_lock:
+            resolved, leading, following = self._claim(pending, self._inflight, Future)
+
+        keys = list(leading)
+        try:
+            if self.max_workers > 1 and len(keys) > 1:
+                values = list(self._get_executor().map(
+                    self._resolve, keys, [pending[key] for key in keys], [leading[key] for key in keys]
+                ))
+            else:
+                values = [self._resolve(key, pending[key], leading[key]) for key in keys]
+        except BaseException as e:
+            with self._inflight_lock:
+                self._abandon(leading, self._inflight, e)
+            raise
+        resolved.update(zip(keys, values))
+
+        for key, future in following.items():
+            resolved[key] = future.result()
+        return resolved
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # One long-lived pool, so its threads (and their per-thread backend connections) are reused across
+        # calls. A forked process (see parallel.py) inherits the pool without its threads and builds its own.
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="geordie-geocode")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def close(self):
+        """
+        Stop the lookup threads. They are started again if the linker is used afterwards.
+        """
+        with self._executor_lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ---------------- Nominatim (asyncio) ----------------
+    def _get_async_app(self):
+        loop = asyncio.get_running_loop()
+        if self._async_app is None or self._async_loop is not loop:
+            from geopy.adapters import AioHTTPAdapter
+            self._async_app = Nominatim(user_agent=self.user_agent, adapter_factory=AioHTTPAdapter)
+            self._async_loop = loop
+            self._ainflight = {}
+        return self._async_app
+
+    async def _off_loop(self, function, *args):
+        # Run a call that may reach the persistent backend (blocking disk or network I/O, e.g. a SQLite write
+        # waiting on a lock) in the loop's default executor, so it does not stall the other tasks
+        if self.cache_backend is None:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def _afetch(self, entity: str):
+        # Async counterpart of _fetch
+        app = self._get_async_app()
+        self._counters.incr("rate_limit_wait_seconds", await self._rate_limiter.aacquire())
+        start = time.perf_counter()
+        try:
+            res = await app.geocode(
+                entity,
+                addressdetails=self.addressdetails,
+                language=self.language,
+                extratags=self.extratags,
+            )
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            self._logger.warning(f"Nominatim error for '{entity}': {e}")
+            self._counters.incr("geocode_errors")
+            return self._to_cache_value(None), False
+        finally:
+            self._observe_geocode(time.perf_counter() - start)
+        return self._to_cache_value(res.raw if res is not None else None), True
+
+    async def _afetch_many(self, pending: dict) -> dict:
+        # Async counterpart of _fetch_many: up to max_workers lookups in flight on the loop, coalesced across tasks
+        self._get_async_app()
+        loop = asyncio.get_running_loop()
+        resolved, leading, following = self._claim(pending, self._ainflight, loop.create_future)
+        if self._alookup_loop is not loop:
+            # asyncio primitives belong to one loop: the lookup slots are shared by all the tasks of this one
+            self._alookup_slots = asyncio.Semaphore(max(1, self.max_workers))
+            self._alookup_loop = loop
+
+        async def resolve(key):
+            future = leading[key]
+            try:
+                async with self._alookup_slots:
+                    fetched, persist = await self._afetch(pending[key])
+                    value = await self._off_loop(self._cache_set, key, fetched, persist)
+                future.set_result(value)
+                return value
+            except BaseException as e:
+                self._fail(future, e)
+                raise
+            finally:
+                self._ainflight.pop(key, None)
+
+        keys = list(leading)
+        try:
+            values = await asyncio.gather(*(resolve(key) for key in keys))
+        except BaseException as e:
+            # Lookups cancelled before they started never reach the finally of resolve()
+            self._abandon(leading, self._ainflight, e)
+            raise
+        resolved.update(zip(keys, values))
+
+        for key, future in following.items():
+            resolved[key] = await asyncio.shield(future)
+        return resolved
+
+    async def aclose(self):
+        """
+        Close the HTTP session of the async geocoder, if one was opened.
+        """
+        if self._async_app is not None:
+            await self._async_app.__aexit__(None, None, None)
+            self._async_app = None
+            self._async_loop = None
+
     # ---------------- Main API ----------------
-    def link_entities(self, entities_in_sentence):
+    @staticmethod
+    def _entity_of(item) -> str:
+        return item.get('entity_normalised') or item.get('entity') or ""
+
+    def _split_cached(self, entities_in_sentence):
+        # Fill the items found in cache; return all items, the misses as (item, key) and {key: entity} to look up
         result = []
+        misses = []  # (item, key) not found in cache
+        pending = {}  # key -> entity to look up on Nominatim
 
         for item in entities_in_sentence:
-            entity = item.get('entity_normalised') or item.get('entity') or ""
+            entity = self._entity_of(item)
             key = self._make_key(entity)
+            result.append(item)
 
             cached = self._cache_get(key)
             if cached is not None:
                 # cached is a dict like {"osm": {...} or None, "osm_raw": {...} or None}
-                item.update(cached)
-                result.append(item)
+                item.update(self._result_value(cached))
                 continue
 
-            # Not in cache → call Nominatim
-            try:
-                res = self.app.geocode(
-                    entity,
-                    addressdetails=self.addressdetails,
-                    language=self.language,
-                    extratags=self.extratags,
-                )
-            except (GeocoderTimedOut, GeocoderServiceError) as e:
-                self._logger.warning(f"Nominatim error for '{entity}': {e}")
-                item["osm"] = None
-                item["osm_raw"] = None
-                # Cache the negative result to avoid hammering on repeated failures
-                self._cache_set(key, {"osm": None, "osm_raw": None})
-                result.append(item)
-                continue
+            # Not in cache → call Nominatim (once per distinct key)
+            misses.append((item, key))
+            pending.setdefault(key, entity)
+        return result, misses, pending
 
-            # No result found
-            if res is None:
-                item["osm"] = None
-                item["osm_raw"] = None
-                self._cache_set(key, {"osm": None, "osm_raw": None})
-                result.append(item)
-                if self._sleep:
-                    time.sleep(self._sleep)
-                continue
+    def _fill_misses(self, misses, resolved: dict):
+        for item, key in misses:
+            item.update(self._result_value(resolved[key]))
 
-            result_osm = res.raw
-
-            # Filter by importance to avoid low-confidence matches
-            importance = result_osm.get("importance", 0.0) or 0.0
-            if importance < self.importance_threshold:
-                item["osm"] = None
-                item["osm_raw"] = None
-                self._cache_set(key, {"osm": None, "osm_raw": None})
-                result.append(item)
-                if self._sleep:
-                    time.sleep(self._sleep)
-                continue
+    def link_entities(self, entities_in_sentence):
+        result, misses, pending = self._split_cached(entities_in_sentence)
+        self._fill_misses(misses, self._fetch_many(pending))
+        return result
 
-            # Build compact subset
-            subset = {k: result_osm.get(k) for k in keys_to_extract}
+    async def alink_entities(self, entities_in_sentence):
+        """
+        Asyncio version of link_entities: neither Nominatim lookups nor the persistent cache_backend block
+        the event loop.
+        """
+        result, misses, pending = await self._off_loop(self._split_cached, entities_in_sentence)
+        self._fill_misses(misses, await self._afetch_many(pending))
+        return result
 
-            address = result_osm.get("address")
-            if address is not None and isinstance(address, dict) and address:
-                # a rough "entity_type" as the first key in address (kept from your logic)
-                subset["entity_type"] = list(address.keys())[0]
-                address_subset = {k: address.get(k) for k in address_keys_to_extract}
-            else:
-                address_subset = {k: None for k in address_keys_to_extract}
-            subset.update(address_subset)
+    def link_corpus(self, entities_in_sentence, max_lookups: int | None = None):
+        """
+        Link the mentions of a whole batch or corpus in two phases: collect the distinct entities,
+        resolve each one once (most frequent first, so partial runs cover most mentions), then join the
+        results back onto every item. A summary is logged and kept in self.last_link_report.
+        :param entities_in_sentence: An iterable of items (as for link_entities).
+        :param max_lookups: (Optional) Maximum number of Nominatim calls. Items of entities left unresolved
+            get osm=None without caching, so a later run can resolve them.
+        :return: The list of items, with 'osm' and 'osm_raw' attached.
+        """
+        result = list(entities_in_sentence)
+        keys = [self._make_key(self._entity_of(item)) for item in result]
+        frequencies = Counter(keys)
+        entities = {}
+        for item, key in zip(result, keys):
+            entities.setdefault(key, self._entity_of(item))
 
-            extratags = result_osm.get("extratags")
-            if extratags is not None and isinstance(extratags, dict):
-                extratags_subset = {k: extratags.get(k) for k in extratags_keys_to_extract}
+        # Phase 1: everything already known (persistent entries in one query), then the rest by frequency
+        from_backend = self._prefetch_keys(frequencies)
+        resolved = {}
+        for key, count in frequencies.items():
+            if key in from_backend:
+                tier, cached = "backend_hits", from_backend[key]
             else:
-                extratags_subset = {k: None for k in extratags_keys_to_extract}
-            subset.update(extratags_subset)
-
-            item['osm'] = subset
-            item['osm_raw'] = result_osm
-
-            # Store in cache
-            self._cache_set(key, {"osm": subset, "osm_raw": result_osm})
-
-            result.append(item)
+                tier, cached = self._lookup(key)
+            # Counted per mention, as link_entities does: the first mention hits its tier and the repeats
+            # hit the in-memory tier (or miss, if the entity is not cached)
+            self._count_lookup(tier, cached)
+            if count > 1:
+                self._count_lookup("memory_hits", cached, count - 1)
+            if cached is not None:
+                resolved[key] = cached
+        pending = [key for key, _ in frequencies.most_common() if key not in resolved]
+        unresolved = pending[max_lookups:] if max_lookups is not None else []
+        pending = pending[:max_lookups] if max_lookups is not None else pending
+        cache_hits = len(resolved)
+        resolved.update(self._fetch_many({key: entities[key] for key in pending}))
 
-            if self._sleep:
-                time.sleep(self._sleep)
+        # Phase 2: join back
+        for item, key in zip(result, keys):
+            value = resolved.get(key)
+            item.update(self._result_value(value) if value is not None else self._to_cache_value(None))
 
+        # Mentions left unresolved were neither looked up nor answered: they saved no call
+        unresolved_mentions = sum(frequencies[key] for key in unresolved)
+        saved = len(result) - len(pending) - unresolved_mentions
+        self.last_link_report = {
+            "mentions": len(result),
+            "unique_entities": len(frequencies),
+            "cache_hits": cache_hits,
+            "network_calls": len(pending),
+            "network_calls_saved": saved,
+            "unresolved_entities": len(unresolved),
+            "unresolved_mentions": unresolved_mentions,
+        }
+        self._logger.info(
+            f"Linked {len(result) - unresolved_mentions} of {len(result)} mentions of {len(frequencies)} "
+            f"distinct entities with {len(pending)} Nominatim calls ({saved} saved)"
+        )
         return result
@@ -0,0 +1,176 @@
+"""
+Lightweight, thread-safe metrics primitives (counters, histograms and a registry exporting them) used to instrument geordie.
+"""
+import bisect
+import json
+import threading
+
+# Upper bounds (seconds) of the default latency buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counters:
+    """
+    Named counters (ints or floats) that can be incremented from several threads.
+    """
+    def __init__(self):
+        self._values: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def get(self, name: str) -> float:
+        return self._values.get(name, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Histogram with fixed bucket bounds, in the Prometheus style: cumulative counts per upper bound,
+    plus the number and sum of the observations.
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """
+        :return: A dict with 'buckets' ({upper bound: cumulative count}, "+Inf" last), 'count' and 'sum'.
+        """
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets + ("+Inf",), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "count": cumulative, "sum": total}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_bound(bound) -> str:
+    return bound if isinstance(bound, str) else repr(float(bound))
+
+
+class MetricsRegistry:
+    """
+    Labelled counters and histograms, exported as JSON or in the Prometheus text exposition format.
+    Metrics are created on first use: registry.incr("geordie_stage_items_total", 3, stage="ner").
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        :param buckets: Upper bounds of the histograms.
+        """
+        self.buckets = buckets
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._help: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        """
+        Set the HELP text of a metric in the Prometheus export.
+        """
+        self._help[name] = help_text
+
+    def incr(self, name: str, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def snapshot(self) -> dict:
+        """
+        :return: A JSON-serialisable dict {"counters": {name: [series]}, "histograms": {name: [series]}},
+            where each series is {"labels": {...}, "value": ...} for counters and {"labels": {...}, **Histogram.snapshot()}
+            for histograms (bucket bounds as strings).
+        """
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+        result = {"counters": {}, "histograms": {}}
+        for name, series in counters.items():
+            result["counters"][name] = [{"labels": dict(key), "value": value} for key, value in series.items()]
+        for name, series in histograms.items():
+            result["histograms"][name] = []
+            for key, histogram in series.items():
+                data = histogram.snapshot()
+                data["buckets"] = {_format_bound(bound): count for bound, count in data["buckets"].items()}
+                result["histograms"][name].append({"labels": dict(key), **data})
+        return result
+
+    def to_json(self, **kwargs) -> str:
+        """
+        The snapshot() as a JSON string; keyword arguments are passed to json.dumps.
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format (e.g. to serve on a /metrics endpoint).
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, series in snapshot["counters"].items():
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for entry in series:
+                lines.append(f"{name}{_format_labels(_label_key(entry['labels']))} {entry['value']}")
+        for name, series in snapshot["histograms"].items():
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for entry in series:
+                labels = _label_key(entry["labels"])
+                for bound, count in entry["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels(labels, (('le', bound),))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {entry['sum']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
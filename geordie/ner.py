@@ -1,39 +1,95 @@
 from transformers import pipeline, AutoModelForTokenClassification, AutoTokenizer
 
+from .batching import token_lengths, length_sorted_order, restore_order
+from .quantization import check_precision, quantize_dynamic_int8
+
 class GeordieNER:
-    def __init__(self, device):
+    def __init__(
+        self,
+        device,
+        sort_by_length: bool = True,
+        model_name: str = "SIRIS-Lab/geordie-ner",
+        backend: str = "torch",
+        precision: str = "fp32",
+        window_size: int = 512,
+        stride: int | None = 128,
+    ):
         """
         Initialize the NER component using Hugging Face's transformers pipeline.
         :param device: 'cpu' or 'cuda' to specify the computation device.
+        :param sort_by_length: Batch texts of similar tokenized length together to minimise padding.
+        :param model_name: Hugging Face model id or local directory of the token classification model.
+        :param backend: "torch", or "onnx" to run the model with ONNX Runtime (exported once, see onnx_backend).
+        :param precision: "fp32", or "int8" for dynamic quantization of the linear layers (CPU, torch backend).
+        :param window_size: Maximum number of tokens per forward pass (at most the model's 512 positions).
+        :param stride: Tokens shared by consecutive windows. Texts longer than window_size are split into
+            overlapping windows, batched across texts; entities found in two windows are merged and offsets
+            refer to the original text. None truncates texts to window_size instead.
         """
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"backend must be 'torch' or 'onnx', not {backend!r}")
+        check_precision(precision, device, backend)
+        self.sort_by_length = sort_by_length
+        self.model_name = model_name
+        self.backend = backend
+        self.precision = precision
+        self.window_size = window_size
+        self.stride = stride
+
         # Set device number: -1 for CPU, or the CUDA device index (typically 0)
         # device_num = 0 if device == 'cuda' else -1
 
         # Load the model and tokenizer
-        self.model = AutoModelForTokenClassification.from_pretrained("SIRIS-Lab/geordie-ner")
-        self.tokenizer = AutoTokenizer.from_pretrained("SIRIS-Lab/geordie-ner")
-        self.tokenizer.model_max_length = 512
+        self.model = AutoModelForTokenClassification.from_pretrained(model_name)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.tokenizer.model_max_length = window_size
+        if backend == "onnx":
+            from .onnx_backend import use_onnx
+            use_onnx(self.model, device=device)
+        if precision == "int8":
+            self.model = quantize_dynamic_int8(self.model)
 
         # Initialize the NER pipeline with aggregation strategy 'simple'
         self.ner_pipeline = pipeline(model=self.model, 
                                      tokenizer=self.tokenizer,
                                      task="ner",
                                      aggregation_strategy="simple",  # Aggregates overlapping token spans into a single entity
+                                     stride=stride,  # Overlapping windows over long texts (None: truncation)
                                      device=device  # Set device: -1 for CPU, or 0 (or other index) for CUDA
                                      )
 
-    def extract_entities(self, text):
+    def extract_entities(self, text, batch_size=8):
         """
         Perform NER on a single text.
         :param text: The text to process.
+        :param batch_size: Number of windows per forward pass, for texts longer than window_size.
         :return: A list of recognized entities with aggregation.
         """
-        return self.ner_pipeline(text)
+        return self.ner_pipeline(text, batch_size=batch_size)
+
+    def token_lengths(self, texts):
+        """
+        Number of tokens the model processes for each text: long texts count all their windows.
+        :param texts: A list of texts.
+        :return: A list with the number of tokens of each text.
+        """
+        return token_lengths(self.tokenizer, texts, stride=self.stride)
 
-    def extract_entities_from_corpus(self, texts):
+    def extract_entities_from_corpus(self, texts, batch_size=8):
         """
         Perform NER on a corpus of texts.
         :param texts: A list of texts to process.
+        :param batch_size: Number of texts (or windows of long texts) per forward pass.
         :return: A list of lists, where each inner list contains entities for each text.
         """
-        return self.ner_pipeline(texts)
\ No newline at end of file
+        texts = list(texts)
+        if not texts:
+            return []
+        # A single batch is padded the same in any order, so only sort when there are several
+        if not self.sort_by_length or batch_size <= 1 or len(texts) <= batch_size:
+            return self.ner_pipeline(texts, batch_size=batch_size)
+
+        # Sort by tokenized length so each batch is padded as little as possible, then restore input order
+        order = length_sorted_order(self.token_lengths(texts))
+        outputs = self.ner_pipeline([texts[i] for i in order], batch_size=batch_size)
+        return restore_order(outputs, order)
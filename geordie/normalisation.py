@@ -0,0 +1,167 @@
+"""
+Normalisation of demonyms, adjectives and country codes into country names.
+
+A character trie over the keys of `transformed_dict` replaces the single regex alternation of every key.
+Matching follows the regex semantics exactly: case-insensitive, delimited by word boundaries (\\b),
+leftmost match first and, among the keys matching at the same position, the one listed first.
+
+The trie and the replacement table are shipped prebuilt in resources/normaliser.pkl, so workers do not
+execute resources/demonyms_and_adjectives.py (the source of truth) at startup. Rebuild the bundle after
+editing the resources with `python -m geordie.resources.build`.
+"""
+import hashlib
+import logging
+import pickle
+from importlib.resources import files
+
+_END = None  # trie key holding the priority of the key that ends at a node
+
+BUNDLE_NAME = "normaliser.pkl"
+BUNDLE_VERSION = 1
+SOURCE_NAME = "demonyms_and_adjectives.py"
+
+_logger = logging.getLogger(__name__)
+
+
+def _is_word(char: str) -> bool:
+    # Same definition as \w for str patterns
+    return char.isalnum() or char == "_"
+
+
+def _at_boundary(text: str, i: int) -> bool:
+    before = i > 0 and _is_word(text[i - 1])
+    after = i < len(text) and _is_word(text[i])
+    return before != after
+
+
+class GeoNormaliser:
+    def __init__(self, keys, replacements: dict):
+        """
+        Build the matcher.
+        :param keys: Keys to match, in priority order (the order of the former regex alternation).
+        :param replacements: Mapping from the exact matched text to its replacement. Matches missing from it are kept.
+        """
+        self.replacements = replacements
+        self._root = {}
+        for priority, key in enumerate(keys):
+            node = self._root
+            for char in key:
+                node = node.setdefault(char.lower(), {})
+            # Case variants of a key end at the same node: keep the first one listed
+            if _END not in node:
+                node[_END] = priority
+
+    @classmethod
+    def from_resources(cls):
+        """
+        Build the matcher from the demonyms, adjectives and country codes in geordie.resources.
+        """
+        from .resources.demonyms_and_adjectives import transformed_dict, base_transformed_dict
+        return cls(transformed_dict.keys(), base_transformed_dict)
+
+    @classmethod
+    def _from_trie(cls, root: dict, replacements: dict):
+        normaliser = cls.__new__(cls)
+        normaliser.replacements = replacements
+        normaliser._root = root
+        return normaliser
+
+    def _match_at(self, text: str, i: int):
+        # End of the highest-priority key matching text[i:] and followed by a word boundary, or None
+        node = self._root.get(text[i].lower())
+        best_priority, best_end = None, None
+        j = i
+        while node is not None:
+            j += 1
+            priority = node.get(_END)
+            if priority is not None and (best_priority is None or priority < best_priority) and _at_boundary(text, j):
+                best_priority, best_end = priority, j
+            if j == len(text):
+                break
+            node = node.get(text[j].lower())
+        return best_end
+
+    def normalise(self, text: str) -> str:
+        """
+        Replace every demonym, adjective or country code in a text with its country name.
+        :param text: The text to normalise (typically an entity mention).
+        :return: The normalised text.
+        """
+        parts = []
+        last = i = 0
+        n = len(text)
+        while i < n:
+            end = self._match_at(text, i) if text[i].lower() in self._root and _at_boundary(text, i) else None
+            if end is None:
+                i += 1
+                continue
+            match = text[i:end]
+            parts.append(text[last:i])
+            parts.append(self.replacements.get(match, match))
+            last = i = end
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
+
+
+def _source_hash():
+    # Hash of the resource module the bundle was built from; None when only bytecode is installed
+    source = files("geordie.resources") / SOURCE_NAME
+    if not source.is_file():
+        return None
+    return hashlib.sha256(source.read_bytes()).hexdigest()
+
+
+def save_bundle(normaliser: GeoNormaliser, path) -> None:
+    """
+    Serialise the trie and the replacement table of a normaliser.
+    :param normaliser: The normaliser to serialise.
+    :param path: Destination file.
+    """
+    bundle = {
+        "version": BUNDLE_VERSION,
+        "source_hash": _source_hash(),
+        "replacements": normaliser.replacements,
+        "trie": normaliser._root,
+    }
+    with open(path, "wb") as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_bundle(path=None) -> GeoNormaliser | None:
+    """
+    Load a normaliser serialised with save_bundle.
+    :param path: (Optional) Bundle file. Defaults to the one packaged in geordie.resources.
+    :return: The normaliser, or None if the bundle is missing, from another version or built from outdated resources.
+    """
+    bundle_file = files("geordie.resources") / BUNDLE_NAME if path is None else path
+    try:
+        with open(bundle_file, "rb") as f:
+            bundle = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    if bundle.get("version") != BUNDLE_VERSION:
+        return None
+    source_hash = _source_hash()
+    if source_hash is not None and bundle.get("source_hash") != source_hash:
+        _logger.warning(f"{BUNDLE_NAME} is outdated; run `python -m geordie.resources.build` to rebuild it")
+        return None
+    return GeoNormaliser._from_trie(bundle["trie"], bundle["replacements"])
+
+
+_default_normaliser = None
+
+
+def get_normaliser() -> GeoNormaliser:
+    """
+    Shared normaliser, loaded from the packaged bundle on first use (or built from the resources if it is missing or stale).
+    """
+    global _default_normaliser
+    if _default_normaliser is None:
+        _default_normaliser = load_bundle() or GeoNormaliser.from_resources()
+    return _default_normaliser
+
+
+def normalise_geographical_entity(entity: str) -> str:
+    return get_normaliser().normalise(entity)
@@ -0,0 +1,143 @@
+"""
+ONNX Runtime backend for the geordie models.
+
+The Hugging Face model is exported to ONNX once, cached on disk, and its forward pass is replaced by an
+ONNX Runtime session. The transformers pipeline around it (tokenization, NER aggregation, label mapping)
+is unchanged, so outputs match the PyTorch backend up to floating point differences.
+
+Requires the optional dependencies onnx and onnxruntime (pip install geordie[onnx]).
+"""
+import hashlib
+import logging
+import os
+import re
+import warnings
+
+import numpy as np
+import torch
+from transformers.modeling_outputs import SequenceClassifierOutput, TokenClassifierOutput
+
+ONNX_OPSET = 17
+INPUT_NAMES = ["input_ids", "attention_mask"]
+
+_logger = logging.getLogger(__name__)
+
+
+def _is_token_classifier(model) -> bool:
+    return "TokenClassification" in type(model).__name__
+
+
+def default_cache_dir() -> str:
+    """
+    Directory of the exported graphs: $GEORDIE_ONNX_CACHE, or ~/.cache/geordie/onnx.
+    """
+    return os.environ.get("GEORDIE_ONNX_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "geordie", "onnx")
+
+
+def _fingerprint(model) -> str:
+    # Identifies the weights the graph is exported from: the hub revision when there is one, else the weights themselves
+    digest = hashlib.sha256()
+    digest.update(f"{model.config._name_or_path}|{type(model).__name__}|{torch.__version__}|{ONNX_OPSET}".encode())
+    revision = getattr(model.config, "_commit_hash", None)
+    if revision:
+        digest.update(revision.encode())
+    else:
+        for name, tensor in model.state_dict().items():
+            digest.update(name.encode())
+            digest.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def export_path(model, cache_dir: str | None = None) -> str:
+    """
+    Path of the cached ONNX graph of a model.
+    """
+    name = re.sub(r"[^\w.-]+", "--", model.config._name_or_path.strip("/\\")) or "model"
+    return os.path.join(cache_dir or default_cache_dir(), f"{name}-{_fingerprint(model)}.onnx")
+
+
+def export_onnx(model, path: str) -> str:
+    """
+    Export the forward pass of a model (input_ids, attention_mask -> logits) to ONNX, with dynamic
+    batch and sequence axes.
+    :return: The path of the graph.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    dummy = {name: torch.ones((2, 8), dtype=torch.long) for name in INPUT_NAMES}
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES}
+    # Token classification gives logits per token, sequence classification one row per input
+    dynamic_axes["logits"] = {0: "batch", 1: "sequence"} if _is_token_classifier(model) else {0: "batch"}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    was_training = model.training
+    model.eval()
+    try:
+        # The tracer warns about shape-dependent branches in the attention masking; the graph handles padding correctly
+        with torch.no_grad(), warnings.catch_warnings():
+            warnings.simplefilter("ignore", torch.jit.TracerWarning)
+            torch.onnx.export(
+                model,
+                (),
+                tmp_path,
+                kwargs=dummy,
+                input_names=INPUT_NAMES,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+                dynamo=False,
+            )
+        # Atomic, so concurrent processes never load a partial file
+        os.replace(tmp_path, path)
+    finally:
+        model.train(was_training)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+class OnnxForward:
+    """
+    Stand-in for a model's forward method running an ONNX Runtime session. Returns the same output type
+    as the PyTorch model, so the pipeline post-processing is unchanged.
+    """
+    def __init__(self, path: str, output_class, device="cpu", intra_op_threads: int | None = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        providers = ["CPUExecutionProvider"]
+        if str(device).startswith("cuda") and "CUDAExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=options, providers=providers)
+        self.output_class = output_class
+
+    def __call__(self, input_ids=None, attention_mask=None, **kwargs):
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        feeds = {
+            "input_ids": input_ids.cpu().numpy().astype(np.int64),
+            "attention_mask": attention_mask.cpu().numpy().astype(np.int64),
+        }
+        (logits,) = self.session.run(["logits"], feeds)
+        return self.output_class(logits=torch.from_numpy(logits).to(input_ids.device))
+
+
+def use_onnx(model, device="cpu", cache_dir: str | None = None, intra_op_threads: int | None = None) -> str:
+    """
+    Run a token or sequence classification model with ONNX Runtime: export it (once, to cache_dir) and
+    replace its forward pass by the session. The model object stays usable by transformers pipelines.
+    :param model: A Hugging Face model for token or sequence classification.
+    :param device: 'cpu' or 'cuda' (the CUDA provider is used when onnxruntime-gpu is installed).
+    :param cache_dir: (Optional) Directory of the exported graphs (see default_cache_dir).
+    :param intra_op_threads: (Optional) Threads per ONNX Runtime session.
+    :return: The path of the ONNX graph.
+    """
+    output_class = TokenClassifierOutput if _is_token_classifier(model) else SequenceClassifierOutput
+    path = export_path(model, cache_dir)
+    if not os.path.exists(path):
+        _logger.info(f"Exporting {model.config._name_or_path} to {path}")
+        export_onnx(model, path)
+    model.forward = OnnxForward(path, output_class, device=device, intra_op_threads=intra_op_threads)
+    return path
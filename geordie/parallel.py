@@ -0,0 +1,108 @@
+"""
+Multiprocess corpus runner.
+
+The Geordie pipeline (models included) is built once in the parent process and worker processes are
+forked from it, so they share the model weights copy-on-write instead of each loading their own copy.
+Each worker runs process_corpus on batches of documents with a small number of torch threads, which
+scales better on many-core CPUs than one process with many intra-op threads. Results are streamed back
+in input order.
+
+Requires the "fork" start method (Linux; not available on Windows).
+"""
+import gc
+import logging
+import multiprocessing
+import os
+from collections import deque
+from itertools import islice
+
+from .ratelimit import TokenBucket
+
+_logger = logging.getLogger(__name__)
+
+# The pipeline inherited by forked workers (set in the parent just before forking)
+_geordie = None
+
+
+def _init_worker(torch_threads: int, workers: int) -> None:
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    torch.set_grad_enabled(False)
+    # Every worker has its own copy of the rate limiter: share the configured rate between them
+    linker = _geordie.entity_linker
+    if linker.requests_per_second:
+        limiter = linker._rate_limiter
+        linker._rate_limiter = TokenBucket(limiter.rate / workers, limiter.capacity)
+
+
+def _process_batch(texts: list, batch_size: int) -> list:
+    return _geordie.process_corpus(texts, batch_size=batch_size)
+
+
+def _batches(texts, size: int):
+    texts = iter(texts)
+    while True:
+        batch = list(islice(texts, size))
+        if not batch:
+            return
+        yield batch
+
+
+def process_corpus_parallel(
+    geordie,
+    texts,
+    workers: int | None = None,
+    batch_size: int = 8,
+    docs_per_task: int | None = None,
+    torch_threads: int = 1,
+    max_pending: int | None = None,
+):
+    """
+    Process a corpus with a pool of forked worker processes sharing the pipeline's model weights.
+    :param geordie: A Geordie pipeline, built in this process.
+    :param texts: An iterable of texts (read lazily).
+    :param workers: Number of worker processes (default: os.cpu_count() // torch_threads).
+    :param batch_size: Number of texts per NER forward pass in each worker (see process_corpus).
+    :param docs_per_task: Documents sent to a worker at a time (default: 4 * batch_size).
+    :param torch_threads: torch intra-op threads per worker.
+    :param max_pending: Maximum number of tasks queued or running (default: 2 * workers), which bounds
+        the texts and results held in memory.
+    :return: An iterator over the results of each text, in input order (same format as process_text).
+
+    The entity linker is copied into each worker: the rate limit (requests_per_second) is divided between
+    the workers, and geocoding results are only shared between them through a persistent cache_backend
+    (e.g. SQLiteCache). Stage metrics recorded in the workers are not reported back.
+    """
+    global _geordie
+
+    workers = workers or max(1, (os.cpu_count() or 1) // torch_threads)
+    docs_per_task = docs_per_task or 4 * batch_size
+    max_pending = max_pending or 2 * workers
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        if workers > 1:
+            _logger.warning("The 'fork' start method is not available: processing the corpus in this process")
+        for batch in _batches(texts, docs_per_task):
+            yield from geordie.process_corpus(batch, batch_size=batch_size)
+        return
+
+    # Rust tokenizers may deadlock in forked children if their thread pool was used in the parent
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    _geordie = geordie
+    # Move the parent's objects out of the garbage collector's reach, so that collections in the workers
+    # do not write to (and copy) the pages holding them
+    gc.collect()
+    gc.freeze()
+    try:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers, initializer=_init_worker, initargs=(torch_threads, workers)) as pool:
+            pending = deque()
+            for batch in _batches(texts, docs_per_task):
+                pending.append(pool.apply_async(_process_batch, (batch, batch_size)))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+    finally:
+        gc.unfreeze()
+        _geordie = None
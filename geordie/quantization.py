@@ -0,0 +1,38 @@
+"""
+Reduced-precision inference for the geordie models.
+
+precision="int8" applies PyTorch dynamic quantization to the linear layers: their weights are stored
+as int8 and activations are quantized on the fly, which shrinks the models about 4x in their linear
+layers and speeds up CPU inference. Embeddings and layer norms stay in fp32. CPU only.
+"""
+import warnings
+
+PRECISIONS = ("fp32", "int8")
+
+
+def check_precision(precision: str, device=None, backend: str = "torch") -> None:
+    """
+    Raise ValueError for an unknown precision or one the device or backend cannot run.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, not {precision!r}")
+    if precision == "int8" and str(device).startswith("cuda"):
+        raise ValueError("precision='int8' (dynamic quantization) only runs on CPU")
+    if precision == "int8" and backend != "torch":
+        raise ValueError("precision='int8' is only available with the torch backend")
+
+
+def quantize_dynamic_int8(model):
+    """
+    Quantize the torch.nn.Linear layers of a model to int8 (weights) with dynamic activation quantization.
+    :param model: A PyTorch model on CPU.
+    :return: The quantized model, in eval mode.
+    """
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    model.eval()
+    with warnings.catch_warnings():
+        # Recent torch versions flag the quantized tensor dtypes as deprecated; the eager API still works
+        warnings.simplefilter("ignore", UserWarning)
+        return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    - Tokens refill continuously at `rate` per second, up to `capacity` (the allowed burst).
+    - acquire() takes one token, waiting if none is available. Waiting callers reserve their token
+      up front, so concurrent callers are served in turn at the configured rate.
+    """
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        """
+        :param rate: Tokens (requests) per second. None or 0 disables rate limiting.
+        :param capacity: Maximum number of tokens, i.e. requests that can be issued back to back.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # Take a token (possibly going into debt) and return how long the caller must wait for it
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Wait until a request may be issued.
+        :return: Seconds spent waiting.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        """
+        Asyncio version of acquire(): waits without blocking the event loop.
+        :return: Seconds spent waiting.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,85 @@
+"""
+Lazy readers and writers for corpora too large to hold in memory, to use with Geordie.process_stream.
+
+Paths ending in .gz are (de)compressed transparently and "-" stands for stdin/stdout. To keep each
+input record next to its results, pass the records with a key returning their text:
+
+    results = geordie.process_stream(read_jsonl_records("corpus.jsonl"), key=operator.itemgetter("text"))
+    write_jsonl("out.jsonl", ({**record, "geordie": result} for record, result in results))
+"""
+import contextlib
+import gzip
+import json
+import sys
+
+
+@contextlib.contextmanager
+def open_text(path: str, mode: str = "r"):
+    """
+    Open a text file (utf-8), a gzip-compressed one (.gz), or stdin/stdout ("-").
+    """
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+    elif str(path).endswith(".gz"):
+        with gzip.open(path, mode + "t", encoding="utf-8") as f:
+            yield f
+    else:
+        with open(path, mode, encoding="utf-8") as f:
+            yield f
+
+
+def read_lines(path: str):
+    """
+    Yield the non-empty lines of a text file, one document per line, without the line break.
+    """
+    with open_text(path) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                yield line
+
+
+def read_jsonl_records(path: str):
+    """
+    Yield the JSON objects of a JSONL file, one per non-empty line.
+    """
+    with open_text(path) as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}, line {number}: invalid JSON ({e})") from None
+
+
+def read_jsonl(path: str, field: str = "text"):
+    """
+    Yield the text of each record of a JSONL file.
+    :param field: Key of the text in each record.
+    """
+    for record in read_jsonl_records(path):
+        yield record[field]
+
+
+def read_texts(path: str, field: str = "text"):
+    """
+    Yield the documents of a file: records of a JSONL file (.jsonl, .jsonl.gz) or lines of any other file.
+    """
+    if str(path).endswith((".jsonl", ".jsonl.gz")):
+        return read_jsonl(path, field)
+    return read_lines(path)
+
+
+def write_jsonl(path: str, records) -> int:
+    """
+    Write records as JSONL, one line at a time.
+    :return: Number of records written.
+    """
+    count = 0
+    with open_text(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
@@ -0,0 +1,35 @@
+"""
+Build step for the precompiled normaliser bundle.
+
+    python -m geordie.resources.build
+
+Executes demonyms_and_adjectives.py (the source of truth), builds the normaliser trie and writes it,
+together with the final replacement table, to resources/normaliser.pkl.
+"""
+import os
+import time
+
+from ..normalisation import BUNDLE_NAME, GeoNormaliser, load_bundle, save_bundle
+
+
+def build_bundle(path=None) -> str:
+    """
+    Build and write the normaliser bundle.
+    :param path: (Optional) Destination file. Defaults to resources/normaliser.pkl next to this module.
+    :return: The path written.
+    """
+    path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), BUNDLE_NAME)
+    save_bundle(GeoNormaliser.from_resources(), path)
+    return path
+
+
+def main():
+    path = build_bundle()
+    start = time.perf_counter()
+    normaliser = load_bundle(path)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {path} ({os.path.getsize(path) / 1024:.0f} KiB, {len(normaliser.replacements)} replacements, loads in {elapsed * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
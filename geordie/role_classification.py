@@ -1,18 +1,59 @@
+from itertools import islice
+
 from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
 
+from .batching import token_lengths, length_sorted_order
+from .quantization import check_precision, quantize_dynamic_int8
+
+START_MARKER = "[START_ENT]"
+END_MARKER = "[END_ENT]"
+
 class RoleClassifier:
-    def __init__(self, device):
+    def __init__(
+        self,
+        device,
+        batch_size: int = 32,
+        sort_by_length: bool = True,
+        sort_window: int = 16,
+        context_window: int | None = None,
+        model_name: str = "SIRIS-Lab/geordie-role",
+        backend: str = "torch",
+        precision: str = "fp32",
+    ):
         """
         Initialize the Role classification component using Hugging Face's transformers pipeline.
         :param device: 'cpu' or 'cuda' to specify the computation device.
+        :param batch_size: Default number of contexts per forward pass.
+        :param sort_by_length: Batch contexts of similar tokenized length together to minimise padding.
+        :param sort_window: Number of batches read ahead and sorted together when sort_by_length is enabled.
+        :param context_window: (Optional) Number of tokens kept on each side of the marked entity. None keeps the whole sentence.
+        :param model_name: Hugging Face model id or local directory of the sequence classification model.
+        :param backend: "torch", or "onnx" to run the model with ONNX Runtime (exported once, see onnx_backend).
+        :param precision: "fp32", or "int8" for dynamic quantization of the linear layers (CPU, torch backend).
         """
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"backend must be 'torch' or 'onnx', not {backend!r}")
+        check_precision(precision, device, backend)
+        self.model_name = model_name
+        self.backend = backend
+        self.precision = precision
+        self.batch_size = batch_size
+        self.sort_by_length = sort_by_length
+        self.sort_window = sort_window
+        self.context_window = context_window
+
         # Set device number: -1 for CPU, or the CUDA device index (typically 0)
         # device_num = 0 if device == 'cuda' else -1
 
         # Load the model and tokenizer
-        self.model = AutoModelForSequenceClassification.from_pretrained("SIRIS-Lab/geordie-role")
-        self.tokenizer = AutoTokenizer.from_pretrained("SIRIS-Lab/geordie-role")
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.tokenizer.model_max_length = 512 #the important part
+        if backend == "onnx":
+            from .onnx_backend import use_onnx
+            use_onnx(self.model, device=device)
+        if precision == "int8":
+            self.model = quantize_dynamic_int8(self.model)
 
         # Initialize the NER pipeline with aggregation strategy 'simple'
         self.role_pipeline = pipeline(model=self.model, 
@@ -24,23 +65,74 @@ class RoleClassifier:
 
     def classify_role(self, entities_in_sentence):
         """
-        Perform Role classification on a single text.
-        :param text: The text to process.
-        :return: A list of recognized entities with aggregation.
+        Perform Role classification on the mentions of a single text.
+        :param entities_in_sentence: A list of items with a marked 'context'.
+        :return: The same items, each with its 'role' attached.
         """
-        results = []
-        for item in entities_in_sentence:
-            text = item['context']
-            role_type = self.role_pipeline(text)
-            item['role'] = role_type
-            results.append(item)
+        return self.classify_role_from_corpus(entities_in_sentence)
+
+    def classify_role_from_corpus(self, entities_in_sentence, batch_size=None):
+        """
+        Perform Role classification on any number of mentions in batches.
+        :param entities_in_sentence: An iterable of items with a marked 'context' (e.g. the mentions of a whole corpus).
+        :param batch_size: Number of contexts per forward pass (defaults to self.batch_size).
+        :return: A list with the same items, each with its 'role' attached.
+        """
+        batch_size = batch_size or self.batch_size
+        sort_by_length = self.sort_by_length and batch_size > 1
+        # When sorting, read several batches ahead so there are similar lengths to group together
+        window = batch_size * self.sort_window if sort_by_length else batch_size
 
+        items = iter(entities_in_sentence)
+        results = []
+        while True:
+            chunk = list(islice(items, window))
+            if not chunk:
+                break
+            # The model sees the (optionally trimmed) context; the item keeps the full sentence
+            contexts = self.trim_contexts([item['context'] for item in chunk])
+            # A single batch is padded the same in any order, so only sort when there are several
+            if sort_by_length and len(chunk) > batch_size:
+                order = length_sorted_order(token_lengths(self.tokenizer, contexts))
+            else:
+                order = range(len(chunk))
+            scheduled = [chunk[i] for i in order]
+            outputs = self.role_pipeline([contexts[i] for i in order], batch_size=batch_size)
+            for item, role_type in zip(scheduled, outputs):
+                # Keep the single-text output format: a list with the top label
+                item['role'] = [role_type] if isinstance(role_type, dict) else role_type
+            # The role is attached to each item, so the chunk is already back in input order
+            results.extend(chunk)
         return results
 
-    def classify_role_from_corpus(self, texts):
+    def trim_contexts(self, contexts):
         """
-        Perform Role classification on a corpus of texts.
-        :param texts: A list of texts to process.
-        :return: A list of lists, where each inner list contains entities for each text.
+        Trim each marked context to self.context_window tokens on each side of the [START_ENT] ... [END_ENT] span.
+        Contexts without markers, or already within the window, are returned unchanged.
+        :param contexts: A list of marked contexts.
+        :return: A list with the trimmed contexts.
         """
-        return 
\ No newline at end of file
+        if self.context_window is None or not contexts or not self.tokenizer.is_fast:
+            return list(contexts)
+
+        encodings = self.tokenizer(list(contexts), add_special_tokens=False, return_offsets_mapping=True)
+        trimmed = []
+        for context, offsets in zip(contexts, encodings["offset_mapping"]):
+            start_char = context.find(START_MARKER)
+            end_char = context.find(END_MARKER, max(start_char, 0))
+            if start_char < 0 or end_char < 0 or not offsets:
+                trimmed.append(context)
+                continue
+            end_char += len(END_MARKER)
+
+            # First and last tokens of the marked span
+            first = next(i for i, (_, end) in enumerate(offsets) if end > start_char)
+            last = max(i for i, (start, _) in enumerate(offsets) if start < end_char)
+
+            lo = max(0, first - self.context_window)
+            hi = min(len(offsets) - 1, last + self.context_window)
+            if lo == 0 and hi == len(offsets) - 1:
+                trimmed.append(context)
+            else:
+                trimmed.append(context[offsets[lo][0]:offsets[hi][1]])
+        return trimmed
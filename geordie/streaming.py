@@ -0,0 +1,126 @@
+"""
+Bounded, threaded stage pipeline used by Geordie.process_stream.
+
+Batches of documents flow through a chain of stages, each running in its own thread and connected by
+bounded queues, so a slow stage (e.g. waiting on Nominatim) overlaps with the others (model inference)
+while the number of documents held in memory stays capped.
+"""
+import queue
+import threading
+
+_DONE = object()
+# Seconds between checks of the stop flag while blocked on a queue or the in-flight limit
+_POLL = 0.1
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(outbox: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            outbox.put(item, timeout=_POLL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(inbox: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return inbox.get(timeout=_POLL)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+def _read(items, batch_size: int, in_flight: threading.Semaphore, outbox: queue.Queue, stop: threading.Event):
+    # Read the input lazily into batches, blocking while max_in_flight documents are not yet delivered
+    try:
+        items = iter(items)
+        exhausted = False
+        while not exhausted:
+            batch = []
+            while len(batch) < batch_size:
+                # Take a slot before reading, so no more than max_in_flight items are ever read ahead
+                while not in_flight.acquire(timeout=_POLL):
+                    if stop.is_set():
+                        return
+                try:
+                    batch.append(next(items))
+                except StopIteration:
+                    in_flight.release()
+                    exhausted = True
+                    break
+            if batch and not _put(outbox, batch, stop):
+                return
+    except BaseException as e:
+        _put(outbox, _Failure(e), stop)
+        return
+    _put(outbox, _DONE, stop)
+
+
+def _run_stage(function, inbox: queue.Queue, outbox: queue.Queue, stop: threading.Event):
+    while True:
+        item = _get(inbox, stop)
+        if item is _DONE or isinstance(item, _Failure):
+            _put(outbox, item, stop)
+            return
+        try:
+            result = function(item)
+        except BaseException as e:
+            _put(outbox, _Failure(e), stop)
+            return
+        if not _put(outbox, result, stop):
+            return
+
+
+def stream_batches(items, stages, batch_size: int, max_in_flight: int, queue_size: int = 2):
+    """
+    Run batches of items through a chain of stages, each in its own thread.
+    :param items: An iterable of items (read lazily, in a separate thread).
+    :param stages: Functions applied in turn to each batch; the first receives a list of items and the
+        last must return a list with one result per item of the batch.
+    :param batch_size: Items per batch.
+    :param max_in_flight: Maximum number of items read but not yet yielded (at least batch_size).
+    :param queue_size: Capacity, in batches, of the queue after each stage.
+    :return: An iterator over the result of each item, in input order. An exception raised by the input
+        or a stage is re-raised here; closing the iterator early stops the threads.
+    """
+    # Checked here, not in the generator, so that bad arguments fail at the call rather than at the first next()
+    if max_in_flight < batch_size:
+        raise ValueError(f"max_in_flight ({max_in_flight}) must be at least batch_size ({batch_size})")
+    return _stream(items, stages, batch_size, max_in_flight, queue_size)
+
+
+def _stream(items, stages, batch_size: int, max_in_flight: int, queue_size: int):
+    stop = threading.Event()
+    in_flight = threading.Semaphore(max_in_flight)
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(
+        target=_read, args=(items, batch_size, in_flight, queues[0], stop), name="geordie-stream-read", daemon=True,
+    )]
+    for index, function in enumerate(stages):
+        threads.append(threading.Thread(
+            target=_run_stage, args=(function, queues[index], queues[index + 1], stop),
+            name=f"geordie-stream-{index}", daemon=True,
+        ))
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            batch = queues[-1].get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, _Failure):
+                raise batch.error
+            for result in batch:
+                yield result
+                in_flight.release()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
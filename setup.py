@@ -12,4 +12,8 @@ setup(
         "nltk",
         "geopy",
     ],
+    extras_require={
+        "async": ["aiohttp"],  # Geordie.aprocess_text / aprocess_corpus, EntityLinker.alink_entities
+        "onnx": ["onnx", "onnxruntime"],  # Geordie(backend="onnx")
+    },
 )
\ No newline at end of file